@@ -0,0 +1,50 @@
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.synthetic_repo import RepoSpec, create_repo
+from src.services.git_service import GitService
+
+
+def gitpython_status(git_service: GitService):
+    files = []
+    for item in git_service.repo.index.diff(None):
+        files.append((item.a_path, 'deleted' if item.deleted_file else 'modified'))
+    for item in git_service.repo.untracked_files:
+        files.append((item, 'untracked'))
+    return files
+
+
+def measure(func, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare status engines on a synthetic repository")
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--modified', type=float, default=0.05)
+    parser.add_argument('--untracked', type=float, default=0.02)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'repo'
+        create_repo(root, RepoSpec(files=args.files, modified_ratio=args.modified,
+                                   untracked_ratio=args.untracked, history=1))
+        git_service = GitService(str(root))
+
+        for name, func in (('gitpython', lambda: gitpython_status(git_service)),
+                           ('porcelain-v2', git_service.get_unstaged_files)):
+            seconds, count = measure(func, args.repeat)
+            print(f"{name:>14}: {seconds * 1000:8.1f} ms  ({count} entries)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+COMPLETION_PATHS = ('/v1/chat/completions', '/chat/completions')
+STUB_TYPES = ('feat', 'fix', 'refactor', 'chore', 'docs', 'test')
+STREAM_TOKEN_CHARS = 4
+
+
+class LatencyModel:
+    def __init__(self, spec: str = 'fixed:0', rng: Optional[random.Random] = None):
+        kind, _, params = spec.partition(':')
+        self.kind = kind
+        self.params = [float(value) for value in params.split(',') if value]
+        self.rng = rng or random.Random(0)
+
+    def sample(self) -> float:
+        if self.kind == 'fixed':
+            return self.params[0] / 1000 if self.params else 0.0
+        if self.kind == 'uniform':
+            low, high = self.params
+            return self.rng.uniform(low, high) / 1000
+        if self.kind == 'lognormal':
+            # median in ms and sigma of the underlying normal, which gives
+            # the long right tail real API latencies have.
+            median, sigma = self.params
+            return self.rng.lognormvariate(math.log(median), sigma) / 1000
+        raise ValueError(f"Unknown latency model: {self.kind}")
+
+
+class Cassette:
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path and path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry['key']] = entry
+
+    @staticmethod
+    def key(request: dict) -> str:
+        relevant = {k: v for k, v in request.items() if k not in ('stream', 'user')}
+        return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.entries.get(key)
+
+    def add(self, key: str, status: int, body: dict) -> None:
+        entry = {'key': key, 'status': status, 'body': body}
+        with self._lock:
+            self.entries[key] = entry
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class RateLimiter:
+    def __init__(self, rpm: int, tpm: int = 0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window_start = time.monotonic()
+        self.used = 0
+        self.used_tokens = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> Tuple[Optional[str], int, int, float]:
+        # Both budgets share one fixed 60 s window; the first one exhausted
+        # names the 429, as the real API does in the error type.
+        with self._lock:
+            now = time.monotonic()
+            if now - self.window_start >= 60:
+                self.window_start = now
+                self.used = 0
+                self.used_tokens = 0
+            reset = 60 - (now - self.window_start)
+            if self.rpm and self.used >= self.rpm:
+                return 'requests', 0, self._remaining_tokens(), reset
+            if self.tpm and self.used_tokens + tokens > self.tpm:
+                return 'tokens', self._remaining_requests(), self._remaining_tokens(), reset
+            self.used += 1
+            self.used_tokens += tokens
+            return None, self._remaining_requests(), self._remaining_tokens(), reset
+
+    def _remaining_requests(self) -> int:
+        return max(0, self.rpm - self.used) if self.rpm else 0
+
+    def _remaining_tokens(self) -> int:
+        return max(0, self.tpm - self.used_tokens) if self.tpm else 0
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, mode: str = 'stub', latency: str = 'fixed:0', rpm: int = 0,
+                 tpm: int = 0, rate_limit_rate: float = 0.0, error_rate: float = 0.0,
+                 cassette: Optional[Path] = None, upstream: Optional[str] = None, seed: int = 0,
+                 token_latency: float = 0.0):
+        super().__init__(address, _Handler)
+        self.mode = mode
+        self.token_latency = token_latency / 1000
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.latency = LatencyModel(latency, self.rng)
+        self.limiter = RateLimiter(rpm, tpm)
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.cassette = Cassette(cassette)
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self.stats = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'errors': 0, 'replayed': 0, 'recorded': 0,
+                      'closed_early': 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, name: str) -> None:
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def draw(self) -> Tuple[float, float, float]:
+        with self.rng_lock:
+            return self.latency.sample(), self.rng.random(), self.rng.random()
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeLLMServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/stats':
+            with self.server.stats_lock:
+                self._send(200, dict(self.server.stats))
+        else:
+            self._send(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        if self.path not in COMPLETION_PATHS:
+            self._send(404, {'error': {'message': 'not found'}})
+            return
+
+        server = self.server
+        server.count('requests')
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        latency, rate_limit_draw, error_draw = server.draw()
+
+        exceeded, remaining, remaining_tokens, reset = server.limiter.acquire(_request_tokens(request))
+        if exceeded or rate_limit_draw < server.rate_limit_rate:
+            server.count('rate_limited')
+            retry_after = max(1, math.ceil(reset)) if exceeded else 1
+            self._send(429, {'error': {'message': 'Rate limit reached', 'type': exceeded or 'requests'}},
+                       self._limit_headers(remaining, remaining_tokens, reset, retry_after))
+            return
+
+        time.sleep(latency)
+        if error_draw < server.error_rate:
+            server.count('errors')
+            self._send(500, {'error': {'message': 'Injected failure', 'type': 'server_error'}})
+            return
+
+        status, body = self._respond(request)
+        server.count('ok' if status == 200 else 'errors')
+        if status == 200 and request.get('stream'):
+            self._send_stream(body, self._limit_headers(remaining, remaining_tokens, reset))
+        else:
+            self._send(status, body, self._limit_headers(remaining, remaining_tokens, reset))
+
+    def _respond(self, request: dict) -> Tuple[int, dict]:
+        server = self.server
+        key = Cassette.key(request)
+        if server.mode in ('replay', 'record'):
+            entry = server.cassette.get(key)
+            if entry:
+                server.count('replayed')
+                return entry['status'], entry['body']
+            if server.mode == 'replay':
+                return 404, {'error': {'message': f'No recording for request {key[:12]}'}}
+
+            status, body = self._forward(request)
+            server.cassette.add(key, status, body)
+            server.count('recorded')
+            return status, body
+
+        return 200, _stub_completion(request, key)
+
+    def _forward(self, request: dict) -> Tuple[int, dict]:
+        upstream = urllib.request.Request(
+            f"{self.server.upstream}/chat/completions",
+            # Recordings hold whole completions; streams are replayed from them.
+            data=json.dumps({k: v for k, v in request.items() if k not in ('stream', 'stream_options')}).encode('utf-8'),
+            headers={'Content-Type': 'application/json',
+                     'Authorization': self.headers.get('Authorization', '')},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(upstream, timeout=120) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read() or b'{}')
+
+    def _limit_headers(self, remaining: int, remaining_tokens: int, reset: float,
+                       retry_after: Optional[int] = None) -> Dict[str, str]:
+        limiter = self.server.limiter
+        headers = {}
+        if limiter.rpm:
+            headers.update({
+                'x-ratelimit-limit-requests': str(limiter.rpm),
+                'x-ratelimit-remaining-requests': str(remaining),
+                'x-ratelimit-reset-requests': f"{reset:.3f}s",
+            })
+        if limiter.tpm:
+            headers.update({
+                'x-ratelimit-limit-tokens': str(limiter.tpm),
+                'x-ratelimit-remaining-tokens': str(remaining_tokens),
+                'x-ratelimit-reset-tokens': f"{reset:.3f}s",
+            })
+        if retry_after is not None:
+            headers['retry-after'] = str(retry_after)
+        return headers
+
+    def _send(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, body: dict, headers: Dict[str, str]):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        content = body['choices'][0]['message']['content'] if body.get('choices') else ''
+        tokens = [content[i:i + STREAM_TOKEN_CHARS] for i in range(0, len(content), STREAM_TOKEN_CHARS)]
+        try:
+            for n, token in enumerate(tokens + [None]):
+                delta = {'content': token} if token is not None else {}
+                if n == 0:
+                    delta['role'] = 'assistant'
+                chunk = {
+                    'id': body.get('id', 'chatcmpl-stream'),
+                    'object': 'chat.completion.chunk',
+                    'created': body.get('created', 0),
+                    'model': body.get('model', 'stub'),
+                    'choices': [{'index': 0, 'delta': delta,
+                                 'finish_reason': None if token is not None else 'stop'}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                if token is not None and self.server.token_latency:
+                    time.sleep(self.server.token_latency)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early, which is what it is meant to do.
+            self.server.count('closed_early')
+        self.close_connection = True
+
+
+def _request_tokens(request: dict) -> int:
+    # Like the real limiter: prompt size estimated from characters, plus the
+    # completion budget the request reserves.
+    prompt = sum(len(str(m.get('content', ''))) for m in request.get('messages', [])) // 4
+    return prompt + int(request.get('max_tokens') or request.get('max_completion_tokens') or 0)
+
+
+def _stub_message(seed: str) -> str:
+    digest = hashlib.sha256(seed.encode('utf-8')).hexdigest()
+    return f"{STUB_TYPES[int(digest[:8], 16) % len(STUB_TYPES)]}: update module {digest[:6]}"
+
+
+def _stub_completion(request: dict, key: str) -> dict:
+    if (request.get('response_format') or {}).get('type') == 'json_object':
+        user = next((m.get('content', '') for m in request.get('messages', []) if m.get('role') == 'user'), '')
+        parts = re.split(r'^### id: (\S+)\n', user, flags=re.M)
+        messages = {parts[i]: _stub_message(parts[i + 1]) for i in range(1, len(parts) - 1, 2)}
+        message = json.dumps({'messages': messages}, ensure_ascii=False)
+    else:
+        message = _stub_message(key)
+    prompt_tokens = sum(len(str(m.get('content', ''))) for m in request.get('messages', [])) // 4
+    return {
+        'id': f"chatcmpl-{key[:24]}",
+        'object': 'chat.completion',
+        'created': 0,
+        'model': request.get('model', 'stub'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': message},
+            'finish_reason': 'stop',
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': 8,
+            'total_tokens': prompt_tokens + 8,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stand-in server for offline benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--mode', choices=('stub', 'record', 'replay'), default='stub')
+    parser.add_argument('--cassette', type=Path, help="JSONL file for record/replay")
+    parser.add_argument('--upstream', default='https://api.openai.com/v1', help="forwarding target in record mode")
+    parser.add_argument('--latency', default='fixed:0',
+                        help="fixed:<ms> | uniform:<low>,<high> | lognormal:<median>,<sigma>")
+    parser.add_argument('--rpm', type=int, default=0, help="requests per minute before answering 429")
+    parser.add_argument('--tpm', type=int, default=0, help="tokens per minute before answering 429")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="fraction of random 429s")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of random 500s")
+    parser.add_argument('--token-latency', type=float, default=0.0, help="delay between streamed chunks in ms")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer((args.host, args.port), mode=args.mode, latency=args.latency, rpm=args.rpm,
+                           tpm=args.tpm, rate_limit_rate=args.rate_limit_rate, error_rate=args.error_rate,
+                           cassette=args.cassette, upstream=args.upstream, seed=args.seed,
+                           token_latency=args.token_latency)
+    print(f"Serving {args.mode} completions on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from benchmarks.synthetic_repo import RepoSpec, create_repo
+
+SUITES = ('status', 'unpushed', 'file_list', 'commit')
+
+
+class StubLLM:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_commit_message(self, diff: str, language: str = 'en', max_chars=None, use_cache=True,
+                                on_token=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return f"chore: update {len(diff)} chars"
+
+    def generate_commit_messages(self, diffs, language: str = 'en', max_chars=None, use_cache=True):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return {key: f"chore: update {len(diff)} chars" for key, diff in diffs.items()}
+
+
+class TimedLLM:
+    def __init__(self, service):
+        self.service = service
+        self.latencies: List[float] = []
+        self.first_tokens: List[float] = []
+        self._lock = threading.Lock()
+
+    def generate_commit_message(self, diff: str, language: str = 'en', max_chars=None, use_cache=True,
+                                on_token=None):
+        start = time.perf_counter()
+        timed_token = None
+        if on_token:
+            first = []
+
+            def timed_token(text: str):
+                if not first:
+                    first.append(time.perf_counter() - start)
+                    with self._lock:
+                        self.first_tokens.append(first[0])
+                on_token(text)
+
+        try:
+            return self.service.generate_commit_message(diff, language, max_chars, use_cache=use_cache,
+                                                        on_token=timed_token)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+    def generate_commit_messages(self, diffs, language: str = 'en', max_chars=None, use_cache=True):
+        start = time.perf_counter()
+        try:
+            return self.service.generate_commit_messages(diffs, language, max_chars, use_cache=use_cache)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+    @property
+    def calls(self) -> int:
+        return len(self.latencies)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))] * 1000
+
+    return {'p50_ms': at(0.50), 'p95_ms': at(0.95), 'p99_ms': at(0.99), 'max_ms': ordered[-1] * 1000}
+
+
+def measure(func: Callable, repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'median_ms': statistics.median(timings) * 1000,
+        'min_ms': min(timings) * 1000,
+        'max_ms': max(timings) * 1000,
+        'repeat': repeat,
+    }
+
+
+def bench_status(root: Path, repeat: int) -> Dict:
+    from src.services.git_service import GitService
+
+    git_service = GitService(str(root))
+    result = measure(git_service.get_unstaged_files, repeat)
+    result['entries'] = len(git_service.get_unstaged_files())
+    return result
+
+
+def bench_unpushed(root: Path, repeat: int) -> Dict:
+    from src.services.git_service import GitService
+
+    def count():
+        GitService(str(root)).get_unpushed_count()
+
+    git_service = GitService(str(root))
+    return {
+        'count_cold': measure(count, repeat),
+        'count_cached': measure(git_service.get_unpushed_count, repeat),
+        'commits': measure(git_service.get_unpushed_commits, repeat),
+        'unpushed': git_service.get_unpushed_count(),
+    }
+
+
+def bench_file_list(root: Path, repeat: int) -> Dict:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from src.services.git_service import GitService
+    from src.ui.widgets.file_list_widget import FileListWidget
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    files = GitService(str(root)).get_unstaged_files()
+    changed = files[len(files) // 10:] + [(f"zz/new{i}.txt", 'untracked', 'A') for i in range(10)]
+
+    def initial():
+        widget = FileListWidget()
+        widget.set_files(files)
+        app.processEvents()
+        widget.deleteLater()
+
+    widget = FileListWidget()
+    widget.resize(800, 600)
+    widget.show()
+
+    def incremental():
+        widget.set_files(files)
+        app.processEvents()
+        widget.set_files(changed)
+        app.processEvents()
+
+    result = {
+        'initial': measure(initial, repeat),
+        'incremental': measure(incremental, repeat),
+        'entries': len(files),
+    }
+    widget.refresh_timer.stop()
+    return result
+
+
+def make_llm_server(args):
+    from benchmarks.llm_server import FakeLLMServer
+
+    server = FakeLLMServer(('127.0.0.1', 0), mode=args.llm_mode, latency=args.llm_latency_model,
+                           rpm=args.llm_rpm, tpm=args.llm_tpm, rate_limit_rate=args.llm_429_rate,
+                           error_rate=args.llm_error_rate, cassette=args.llm_cassette,
+                           upstream=args.llm_upstream, seed=args.llm_seed,
+                           token_latency=args.llm_token_latency)
+    server.start()
+    return server
+
+
+def bench_commit(root: Path, files: List[str], latency: float, workers: int, server=None,
+                 stream: bool = False, batch_size: int = 1) -> Dict:
+    from src.services.git_service import GitService
+    from src.ui.pages.commit_page import CommitWorker
+
+    if server:
+        from src.services.openai_service import OpenAIService
+
+        llm = TimedLLM(OpenAIService(os.environ.get('OPENAI_API_KEY', 'bench'), base_url=server.base_url))
+    else:
+        llm = StubLLM(latency)
+    errors = []
+    worker = CommitWorker(GitService(str(root)), llm, [(path, 'M') for path in files], 'en',
+                          max_workers=workers, stream=stream, batch_size=batch_size)
+    worker.error.connect(errors.append)
+    rule_stats = {}
+    worker.rule_stats.connect(rule_stats.update)
+    start = time.perf_counter()
+    worker.run()
+    elapsed = time.perf_counter() - start
+    result = {
+        'files': len(files),
+        'total_ms': elapsed * 1000,
+        'per_commit_ms': elapsed * 1000 / max(1, len(files)),
+        'commits_per_s': len(files) / elapsed if elapsed else 0.0,
+        'llm_calls': llm.calls,
+        'llm_latency_ms': latency * 1000,
+        'workers': workers,
+        'batch_size': batch_size,
+        'errors': len(errors),
+        'rules': rule_stats,
+    }
+    if server:
+        del result['llm_latency_ms']
+        result['llm'] = percentiles(llm.latencies)
+        if stream:
+            result['llm']['first_token'] = percentiles(llm.first_tokens)
+        result['client'] = llm.service.stats()
+        llm.service.close()
+        with server.stats_lock:
+            result['server'] = dict(server.stats)
+    return result
+
+
+def run_size(spec: RepoSpec, suites: List[str], args, server=None) -> Dict:
+    with tempfile.TemporaryDirectory(prefix='smartcommit-bench-') as tmp:
+        root = Path(tmp) / 'repo'
+        start = time.perf_counter()
+        modified = create_repo(root, spec)
+        result = {'spec': spec._asdict(), 'setup_ms': (time.perf_counter() - start) * 1000}
+
+        if 'status' in suites:
+            result['status'] = bench_status(root, args.repeat)
+        if 'unpushed' in suites:
+            result['unpushed'] = bench_unpushed(root, args.repeat)
+        if 'file_list' in suites:
+            result['file_list'] = bench_file_list(root, args.repeat)
+        # Runs last because it commits into the synthetic repository.
+        if 'commit' in suites:
+            result['commit'] = bench_commit(root, modified[:args.commit_files],
+                                            args.llm_latency / 1000, args.workers, server, args.llm_stream, args.batch_size)
+        return result
+
+
+def version() -> str:
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                              text=True, cwd=Path(__file__).resolve().parent.parent).stdout.strip()
+    except OSError:
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark status, list rendering and commit throughput")
+    parser.add_argument('--files', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--untracked', type=float, default=0.02)
+    parser.add_argument('--modified', type=float, default=0.05)
+    parser.add_argument('--binary', type=float, default=0.01)
+    parser.add_argument('--large-files', type=int, default=0)
+    parser.add_argument('--large-file-size', type=int, default=5 * 1024 * 1024)
+    parser.add_argument('--history', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--commit-files', type=int, default=50)
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="stub LLM latency in ms")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=1, help="files per LLM request for small diffs")
+    parser.add_argument('--llm-server', action='store_true',
+                        help="drive the real OpenAIService against the local stand-in server")
+    parser.add_argument('--llm-mode', choices=('stub', 'record', 'replay'), default='stub')
+    parser.add_argument('--llm-cassette', type=Path)
+    parser.add_argument('--llm-upstream', default='https://api.openai.com/v1')
+    parser.add_argument('--llm-latency-model', default='lognormal:300,0.5',
+                        help="fixed:<ms> | uniform:<low>,<high> | lognormal:<median>,<sigma>")
+    parser.add_argument('--llm-rpm', type=int, default=0)
+    parser.add_argument('--llm-tpm', type=int, default=0)
+    parser.add_argument('--llm-429-rate', type=float, default=0.0)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--llm-seed', type=int, default=0)
+    parser.add_argument('--llm-stream', action='store_true', help="request streamed completions")
+    parser.add_argument('--llm-token-latency', type=float, default=0.0, help="delay between streamed chunks in ms")
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=list(SUITES))
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        'version': version(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'runs': [],
+    }
+    server = make_llm_server(args) if args.llm_server else None
+    try:
+        for files in args.files:
+            spec = RepoSpec(files=files, depth=args.depth, modified_ratio=args.modified,
+                            untracked_ratio=args.untracked, binary_ratio=args.binary,
+                            large_files=args.large_files, large_file_size=args.large_file_size,
+                            history=args.history)
+            report['runs'].append(run_size(spec, args.suites, args, server))
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding='utf-8')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import os
+import random
+import subprocess
+from pathlib import Path
+from typing import List, NamedTuple
+
+class RepoSpec(NamedTuple):
+    files: int = 1000
+    depth: int = 3
+    fanout: int = 10
+    modified_ratio: float = 0.05
+    untracked_ratio: float = 0.02
+    binary_ratio: float = 0.01
+    large_files: int = 0
+    large_file_size: int = 5 * 1024 * 1024
+    history: int = 10
+    seed: int = 0
+
+
+def file_path(spec: RepoSpec, i: int) -> str:
+    parts = [f"d{(i // spec.fanout ** level) % spec.fanout}" for level in range(spec.depth)]
+    return "/".join(parts + [f"file{i}.txt"])
+
+
+def _text(i: int, revision: int) -> bytes:
+    return "".join(f"line {n} of file {i} rev {revision}\n" for n in range(20)).encode()
+
+
+def _binary(rng: random.Random, size: int) -> bytes:
+    return bytes(rng.getrandbits(8) for _ in range(size)) + b'\0'
+
+
+def _fast_import_stream(spec: RepoSpec, rng: random.Random, paths: List[str], binary: set):
+    yield b"reset refs/heads/main\n"
+    for revision in range(max(1, spec.history)):
+        touched = range(spec.files) if revision == 0 else rng.sample(range(spec.files), min(5, spec.files))
+        message = f"commit {revision}".encode()
+        yield b"commit refs/heads/main\n"
+        yield f"committer Bench <bench@example.com> {1700000000 + revision} +0000\n".encode()
+        yield b"data %d\n%s\n" % (len(message), message)
+        for i in touched:
+            data = _binary(rng, 2048) if i in binary else _text(i, revision)
+            yield f"M 100644 inline {paths[i]}\n".encode()
+            yield b"data %d\n%s\n" % (len(data), data)
+        yield b"\n"
+
+
+def create_repo(root: Path, spec: RepoSpec) -> List[str]:
+    rng = random.Random(spec.seed)
+    paths = [file_path(spec, i) for i in range(spec.files)]
+    binary = set(rng.sample(range(spec.files), int(spec.files * spec.binary_ratio)))
+
+    subprocess.run(['git', 'init', '-q', '-b', 'main', str(root)], check=True)
+    subprocess.run(['git', '-C', str(root), 'config', 'user.name', 'Bench'], check=True)
+    subprocess.run(['git', '-C', str(root), 'config', 'user.email', 'bench@example.com'], check=True)
+
+    importer = subprocess.Popen(['git', '-C', str(root), 'fast-import', '--quiet'], stdin=subprocess.PIPE)
+    for chunk in _fast_import_stream(spec, rng, paths, binary):
+        importer.stdin.write(chunk)
+    importer.stdin.close()
+    if importer.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+    subprocess.run(['git', '-C', str(root), 'reset', '-q', '--hard', 'main'], check=True)
+
+    modified = rng.sample(range(spec.files), int(spec.files * spec.modified_ratio))
+    for i in modified:
+        with open(root / paths[i], 'ab') as f:
+            f.write(b"modified line\n")
+
+    for n in range(int(spec.files * spec.untracked_ratio)):
+        path = root / Path(paths[rng.randrange(spec.files)]).parent / f"untracked{n}.txt"
+        path.write_bytes(_text(n, -1))
+
+    for n in range(spec.large_files):
+        path = root / f"large{n}.bin"
+        with open(path, 'wb') as f:
+            f.write(os.urandom(spec.large_file_size))
+
+    return [paths[i] for i in modified]
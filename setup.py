@@ -10,6 +10,7 @@ setup(
         "openai>=1.0.0",
         "python-dotenv>=0.19.0",
         "watchdog>=2.1.0",
+        "httpx>=0.23.0",
     ],
     entry_points={
         "console_scripts": [
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='smartcommit', description="Generate and apply commit messages")
+    parser.add_argument('-C', '--repo', default='.', help="repository to work in (default: current directory)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    status = commands.add_parser('status', help="list changed files")
+    status.add_argument('--json', action='store_true', help="print machine-readable output")
+
+    commit = commands.add_parser('commit', help="generate messages and commit changed files")
+    commit.add_argument('paths', nargs='*', help="files or directories to commit")
+    commit.add_argument('-a', '--all', action='store_true', help="commit every changed file")
+    commit.add_argument('-n', '--dry-run', action='store_true', help="print the messages without committing")
+    commit.add_argument('--json', action='store_true', help="print machine-readable output")
+    commit.add_argument('--language', choices=('ko', 'en'), help="commit message language")
+    commit.add_argument('--group', action='store_true', default=None, help="group related files into one commit")
+    commit.add_argument('--batch', action='store_true', default=None, help="batch small diffs into one request")
+    commit.add_argument('--no-rules', action='store_true', help="send every change to the LLM")
+    commit.add_argument('--no-cache', action='store_true', help="ignore the message cache")
+    commit.add_argument('-j', '--workers', type=int, help="maximum concurrent LLM requests")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    root = _repo_root(args.repo)
+    if root is None:
+        print(f"smartcommit: not a git repository: {args.repo}", file=sys.stderr)
+        return EXIT_USAGE
+
+    command = cmd_status if args.command == 'status' else cmd_commit
+    args.output = sys.stdout
+    if not args.json:
+        return command(args, root)
+    # The services report problems with print(); under --json those go to
+    # stderr so that stdout carries nothing but the JSON document.
+    with redirect_stdout(sys.stderr):
+        return command(args, root)
+
+
+def cmd_status(args, root: str) -> int:
+    from src.services.git_service import GitService
+
+    files = GitService(root).get_unstaged_files()
+    if args.json:
+        _print_json(args.output, {
+            'repo': root,
+            'files': [{'path': path, 'status': status, 'type': change_type}
+                      for path, status, change_type in files]
+        })
+    else:
+        for path, _, change_type in files:
+            print(f"{change_type} {path}")
+    return EXIT_OK
+
+
+def cmd_commit(args, root: str) -> int:
+    from src.config.settings import Settings
+    from src.services.git_service import GitService
+
+    if not args.all and not args.paths:
+        print("smartcommit: nothing selected; pass paths or --all", file=sys.stderr)
+        return EXIT_USAGE
+
+    settings = Settings()
+    api_key = os.environ.get('OPENAI_API_KEY') or settings.get('openai_api_key')
+    if not api_key:
+        print("smartcommit: no OpenAI API key; set OPENAI_API_KEY or save one in the app settings",
+              file=sys.stderr)
+        return EXIT_USAGE
+
+    git_service = GitService(root)
+    files = [(path, change_type) for path, _, change_type in git_service.get_unstaged_files()]
+    if not args.all:
+        files = _select(files, _relative_paths(args.paths, args.repo, root))
+    if not files:
+        if args.json:
+            _print_json(args.output, {'repo': root, 'dry_run': args.dry_run, 'commits': [], 'errors': []})
+        else:
+            print("nothing to commit", file=sys.stderr)
+        return EXIT_OK
+
+    # The LLM stack is the slowest import by far, so it is only loaded once
+    # there is actually something to send.
+    from src.services.commit_pipeline import CommitPipeline, DEFAULT_BATCH_SIZE
+    from src.services.message_cache import MessageCache
+    from src.services.openai_service import OpenAIService, DEFAULT_MAX_DIFF_CHARS
+    from src.services.rate_limiter import RateLimitScheduler, DEFAULT_MAX_CONCURRENCY
+
+    use_cache = settings.get('message_cache_enabled', True) and not args.no_cache
+    cache = MessageCache() if use_cache else None
+    openai_service = OpenAIService(
+        api_key,
+        cache=cache,
+        base_url=os.environ.get('OPENAI_BASE_URL') or settings.get('openai_base_url'),
+        scheduler=RateLimitScheduler(args.workers or settings.get('max_concurrency', DEFAULT_MAX_CONCURRENCY))
+    )
+
+    errors: List[str] = []
+
+    def on_committed(paths: List[str], message: str):
+        if not args.json:
+            print(f"{message}  ({', '.join(paths)})")
+
+    def on_error(message: str):
+        errors.append(message)
+        if not args.json:
+            print(f"error: {message}", file=sys.stderr)
+
+    group = settings.get('group_commits', False) if args.group is None else args.group
+    batch = settings.get('batch_requests', False) if args.batch is None else args.batch
+    pipeline = CommitPipeline(
+        git_service,
+        openai_service,
+        files,
+        args.language or settings.get('language', 'ko'),
+        context_lines=settings.get('diff_context_lines', 3),
+        max_diff_chars=settings.get('diff_max_chars', DEFAULT_MAX_DIFF_CHARS),
+        use_cache=use_cache,
+        group_files=group,
+        use_rules=settings.get('local_rules_enabled', True) and not args.no_rules,
+        batch_size=DEFAULT_BATCH_SIZE if batch else 1,
+        dry_run=args.dry_run,
+        on_committed=on_committed,
+        on_error=on_error
+    )
+    try:
+        pipeline.run()
+    except KeyboardInterrupt:
+        pipeline.cancel()
+        errors.append("interrupted")
+    finally:
+        openai_service.close()
+        if cache:
+            cache.close()
+
+    if args.json:
+        commits = [{'files': paths, 'message': message, 'commit': sha}
+                   for paths, message, sha in pipeline.committed]
+        if args.dry_run:
+            commits = [{'files': paths, 'message': message} for paths, message in pipeline.messages]
+        _print_json(args.output, {
+            'repo': root,
+            'dry_run': args.dry_run,
+            'commits': commits,
+            'errors': errors,
+            'rules': pipeline.rule_stats()
+        })
+    elif args.dry_run:
+        for paths, message in pipeline.messages:
+            print(f"{message}  ({', '.join(paths)})")
+
+    return EXIT_FAILED if errors else EXIT_OK
+
+
+def _repo_root(path: str) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=path,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8').strip()
+
+
+def _relative_paths(paths: List[str], cwd: str, root: str) -> List[str]:
+    # Like git -C, paths are taken relative to the directory given with --repo.
+    base = Path(root).resolve()
+    relative = []
+    for path in paths:
+        try:
+            relative.append(Path(os.path.abspath(os.path.join(cwd, path))).resolve().relative_to(base).as_posix())
+        except ValueError:
+            print(f"smartcommit: {path} is outside the repository", file=sys.stderr)
+    return relative
+
+
+def _select(files: List[Tuple[str, str]], paths: List[str]) -> List[Tuple[str, str]]:
+    if '.' in paths:
+        return files
+    prefixes = tuple(path.rstrip('/') + '/' for path in paths)
+    wanted = set(paths)
+    return [(path, change_type) for path, change_type in files
+            if path in wanted or path.startswith(prefixes)]
+
+
+def _print_json(output, data: dict):
+    json.dump(data, output, ensure_ascii=False, indent=2)
+    output.write("\n")
@@ -1,50 +1,204 @@
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import atexit
 import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+SAVE_DELAY = 0.5
+MAX_RECENT_PROJECTS = 5
+DEFAULT_SETTINGS = {
+    "openai_api_key": "",
+    "language": "ko",
+    "recent_projects": [],
+}
 
 
 class Settings:
-    def __init__(self):
-        self.config_file = Path.home() / ".gitcommitmanager" / "config.json"
+    def __init__(self, config_file: Path = None, save_delay: float = SAVE_DELAY):
+        self.config_file = config_file or Path.home() / ".gitcommitmanager" / "config.json"
         self.config_file.parent.mkdir(exist_ok=True)
+        self.lock_file = self.config_file.with_name(self.config_file.name + ".lock")
+        self.save_delay = save_delay
+        self._dirty: Dict[str, object] = {}
+        self._recent_ops: List[Tuple[str, Optional[str]]] = []
+        self._create_file = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
         self.load_settings()
+        # Pending changes are written out when the process exits normally.
+        atexit.register(self.flush)
 
     def load_settings(self):
-        if self.config_file.exists():
-            with open(self.config_file, "r", encoding="utf-8") as f:
-                self.settings = json.load(f)
-        else:
-            self.settings = {
-                "openai_api_key": "",
-                "language": "ko",
-                "recent_projects": [],
-            }
-            self.save_settings()
+        self.settings = self._read()
+        if not self.settings:
+            # Defaults are not edits: they are only written if the file is
+            # still missing once the lock is held, never over another
+            # instance's settings.
+            self.settings = json.loads(json.dumps(DEFAULT_SETTINGS))
+            with self._lock:
+                self._create_file = True
+            self._schedule_save()
 
     def save_settings(self):
-        with open(self.config_file, "w", encoding="utf-8") as f:
-            json.dump(self.settings, f, ensure_ascii=False, indent=2)
+        self.flush()
 
     def get(self, key: str, default=None):
-        return self.settings.get(key, default)
+        with self._lock:
+            return self.settings.get(key, default)
 
     def set(self, key: str, value):
-        self.settings[key] = value
-        self.save_settings()
+        self.update({key: value})
+
+    def update(self, values: Dict[str, object]):
+        with self._lock:
+            self.settings.update(values)
+            self._dirty.update(values)
+            if "recent_projects" in values:
+                self._recent_ops.clear()
+        self._schedule_save()
 
     def add_recent_project(self, path: str):
-        recent = self.settings.get("recent_projects", [])
-        if path in recent:
-            recent.remove(path)
-        recent.insert(0, path)
-        self.settings["recent_projects"] = recent[:5]
-        self.save_settings()
+        self._update_recent(("add", path))
 
     def remove_recent_project(self, path: str):
-        self.settings["recent_projects"] = [
-            p for p in self.settings.get("recent_projects", []) if p != path
-        ]
-        self.save_settings()
+        self._update_recent(("remove", path))
 
     def clear_recent_projects(self):
-        self.settings["recent_projects"] = []
-        self.save_settings()
+        self._update_recent(("clear", None))
+
+    def _update_recent(self, op: Tuple[str, Optional[str]]):
+        # Every instance edits the same list, so the edit itself is saved and
+        # replayed on the list read from disk, not the list as seen here.
+        with self._lock:
+            self.settings["recent_projects"] = _apply_recent(self.settings.get("recent_projects", []), [op])
+            self._recent_ops.append(op)
+        self._schedule_save()
+
+    def flush(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        self._write()
+
+    def _schedule_save(self):
+        # Settings are usually changed several at a time, so writes are
+        # coalesced and done off the calling (UI) thread.
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.save_delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            self._timer = None
+        self._write()
+
+    def _write(self):
+        with self._write_lock:
+            with self._lock:
+                pending = dict(self._dirty)
+                self._dirty.clear()
+                recent_ops, self._recent_ops = self._recent_ops, []
+                create_file, self._create_file = self._create_file, False
+            if not pending and not recent_ops and not create_file:
+                return
+
+            try:
+                with self._file_lock():
+                    # Another instance may have saved since we loaded; only the
+                    # keys changed here are applied on top of what is on disk.
+                    merged = self._read()
+                    missing = not self.config_file.exists()
+                    if missing:
+                        merged = json.loads(json.dumps(DEFAULT_SETTINGS))
+                    merged.update(pending)
+                    if recent_ops:
+                        merged["recent_projects"] = _apply_recent(merged.get("recent_projects", []), recent_ops)
+                    if pending or recent_ops or missing:
+                        self._replace(merged)
+            except Exception as e:
+                print(f"Error saving settings: {str(e)}")
+                with self._lock:
+                    for key, value in pending.items():
+                        self._dirty.setdefault(key, value)
+                    if "recent_projects" not in self._dirty:
+                        self._recent_ops = recent_ops + self._recent_ops
+                    self._create_file = self._create_file or create_file
+                return
+
+            with self._lock:
+                for key, value in merged.items():
+                    if key not in self._dirty:
+                        self.settings[key] = value
+                if self._recent_ops and "recent_projects" not in self._dirty:
+                    self.settings["recent_projects"] = _apply_recent(merged.get("recent_projects", []),
+                                                                     self._recent_ops)
+
+    def _read(self) -> Dict[str, object]:
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Error reading settings: {str(e)}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _replace(self, data: Dict[str, object]):
+        fd, tmp_path = tempfile.mkstemp(prefix=self.config_file.name + ".", suffix=".tmp",
+                                        dir=str(self.config_file.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with open(self.lock_file, "a+b") as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _apply_recent(recent: object, ops: List[Tuple[str, Optional[str]]]) -> List[str]:
+    recent = list(recent) if isinstance(recent, list) else []
+    for op, path in ops:
+        if op == "clear":
+            recent = []
+            continue
+        recent = [p for p in recent if p != path]
+        if op == "add":
+            recent.insert(0, path)
+    return recent[:MAX_RECENT_PROJECTS]
@@ -1,14 +1,75 @@
+import multiprocessing
 import sys
-from PyQt6.QtWidgets import QApplication
-from src.ui.main_window import MainWindow
-from src.config.settings import Settings
+import time
+
+CLI_COMMANDS = ('commit', 'status')
+PROFILE_FLAG = '--profile-startup'
+HEAVY_MODULES = ('git', 'openai')
+
+class StartupProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.steps = []
+
+    def mark(self, label: str):
+        now = time.perf_counter()
+        self.steps.append((label, now - self.last))
+        self.last = now
+
+    def report(self):
+        for label, elapsed in self.steps:
+            print(f"{label:<24} {elapsed * 1000:8.1f} ms", file=sys.stderr)
+        print(f"{'first window':<24} {(self.last - self.started) * 1000:8.1f} ms", file=sys.stderr)
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"heavy modules loaded: {', '.join(loaded) or 'none'}", file=sys.stderr)
 
 def main():
+    # In a frozen (PyInstaller) build, spawned scan workers re-run this entry
+    # point; freeze_support runs the worker and exits before any GUI starts.
+    multiprocessing.freeze_support()
+
+    # Terminal commands are dispatched before anything Qt-related is imported.
+    if any(arg in CLI_COMMANDS for arg in sys.argv[1:]):
+        from src.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    profile = None
+    if PROFILE_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_FLAG)
+        profile = StartupProfile()
+
+    from PyQt6.QtWidgets import QApplication
+    if profile:
+        profile.mark('import PyQt6')
+    from src.ui.main_window import MainWindow
+    from src.config.settings import Settings
+    if profile:
+        profile.mark('import main window')
+
     app = QApplication(sys.argv)
+    if profile:
+        profile.mark('QApplication')
     settings = Settings()
+    if profile:
+        profile.mark('load settings')
     window = MainWindow(settings)
+    if profile:
+        profile.mark('build main window')
     window.show()
+
+    if profile:
+        from PyQt6.QtCore import QTimer
+
+        def first_tick():
+            profile.mark('show and first paint')
+            profile.report()
+            app.quit()
+
+        # The first event loop iteration runs after the window has been shown.
+        QTimer.singleShot(0, first_tick)
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,158 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from git.index import IndexFile
+from git.index.fun import hook_path, run_commit_hook
+from src.services.git_service import GitService
+
+NULL_SHA = '0' * 40
+
+class CommitEngine:
+    def __init__(self, git_service: GitService, skip_hooks: bool = False):
+        self.git_service = git_service
+        self.repo = git_service.repo
+        self.skip_hooks = skip_hooks
+        self.head: Optional[str] = None
+        self._tree: Optional[str] = None
+        self._tmp_dir: Optional[str] = None
+        self._env: Optional[Dict[str, str]] = None
+        self._renames: Dict[str, str] = {}
+        self._committed_paths: List[str] = []
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
+
+    def begin(self):
+        # Commits are built in a private index seeded from HEAD, so each one
+        # only touches the paths it contains instead of rewriting .git/index
+        # and rescanning the worktree.
+        self._tmp_dir = tempfile.mkdtemp(prefix='smartcommit-')
+        self._env = dict(os.environ, GIT_INDEX_FILE=os.path.join(self._tmp_dir, 'index'))
+        self.head = self._run('rev-parse', '--verify', '-q', 'HEAD', check=False) or None
+
+        if self.head:
+            self._run('read-tree', 'HEAD', env=self._env)
+            self._tree = self._run('rev-parse', 'HEAD^{tree}')
+            self._renames = self._staged_renames()
+        else:
+            self._run('read-tree', '--empty', env=self._env)
+
+    def commit(self, files: List[Tuple[str, str]], message: str) -> Optional[str]:
+        paths = []
+        removed = []
+        for file_path, change_type in files:
+            rel_path = self.git_service.get_relative_path(file_path)
+            if change_type == 'D':
+                removed.append(rel_path)
+            else:
+                paths.append(rel_path)
+            if change_type == 'R' and rel_path in self._renames:
+                removed.append(self._renames[rel_path])
+
+        try:
+            if paths:
+                self._run('update-index', '--add', '--remove', '-z', '--stdin',
+                          input='\0'.join(paths), env=self._env)
+            if removed:
+                self._run('update-index', '--force-remove', '-z', '--stdin',
+                          input='\0'.join(removed), env=self._env)
+
+            message = self._run_hooks(message)
+            tree = self._run('write-tree', env=self._env)
+            if tree == self._tree:
+                return None
+
+            parents = ['-p', self.head] if self.head else []
+            commit = self._run('commit-tree', tree, *parents, input=message.rstrip('\n') + '\n')
+            subject = message.splitlines()[0] if message else ''
+            self._run('update-ref', '-m', f"commit: {subject}", 'HEAD', commit, self.head or NULL_SHA)
+        except Exception:
+            # Drop the half-applied paths so they do not leak into the next commit.
+            if self.head:
+                self._run('read-tree', self.head, env=self._env)
+            else:
+                self._run('read-tree', '--empty', env=self._env)
+            raise
+
+        self.head = commit
+        self._tree = tree
+        self._committed_paths.extend(paths + removed)
+        self._run_post_commit()
+        return commit
+
+    def finish(self):
+        try:
+            if self._committed_paths:
+                # Bring the real index in line with the new HEAD for the
+                # committed paths, once for the whole run. The paths are file
+                # names, not patterns, so `*`, `?`, `[` and `:` must not match others.
+                self._run('reset', '-q', 'HEAD', '--pathspec-from-file=-', '--pathspec-file-nul',
+                          input='\0'.join(self._committed_paths),
+                          env=dict(os.environ, GIT_LITERAL_PATHSPECS='1'))
+        finally:
+            self._committed_paths = []
+            if self._tmp_dir:
+                shutil.rmtree(self._tmp_dir, ignore_errors=True)
+                self._tmp_dir = None
+
+    def _run_hooks(self, message: str) -> str:
+        if self.skip_hooks:
+            return message
+
+        git_dir = self.repo.git_dir
+        if not any(os.access(hook_path(name, git_dir), os.X_OK) for name in ('pre-commit', 'commit-msg')):
+            return message
+
+        index = IndexFile(self.repo, self._env['GIT_INDEX_FILE'])
+        run_commit_hook('pre-commit', index)
+
+        message_path = os.path.join(self._tmp_dir, 'COMMIT_EDITMSG')
+        with open(message_path, 'w', encoding='utf-8') as f:
+            f.write(message.rstrip('\n') + '\n')
+        run_commit_hook('commit-msg', index, message_path)
+        with open(message_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _run_post_commit(self):
+        if self.skip_hooks or not os.access(hook_path('post-commit', self.repo.git_dir), os.X_OK):
+            return
+        # Like `git commit`, a failing post-commit hook does not undo the commit.
+        try:
+            run_commit_hook('post-commit', IndexFile(self.repo, self._env['GIT_INDEX_FILE']))
+        except Exception as e:
+            print(f"Error running post-commit hook: {str(e)}")
+
+    def _staged_renames(self) -> Dict[str, str]:
+        output = self._run('diff', '--cached', '--name-status', '-M', '-z', 'HEAD')
+        fields = output.split('\0')
+        renames = {}
+        i = 0
+        while i < len(fields) and fields[i]:
+            status = fields[i]
+            if status.startswith(('R', 'C')):
+                renames[fields[i + 2]] = fields[i + 1]
+                i += 3
+            else:
+                i += 2
+        return renames
+
+    def _run(self, *args: str, input: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+             check: bool = True) -> str:
+        result = subprocess.run(
+            ['git', *args],
+            cwd=str(self.git_service.repo_path),
+            env=env,
+            input=input.encode('utf-8') if input is not None else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        if check and result.returncode != 0:
+            raise Exception(f"git {args[0]} failed: {result.stderr.decode('utf-8', errors='replace').strip()}")
+        return result.stdout.decode('utf-8', errors='replace').strip()
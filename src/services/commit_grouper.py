@@ -0,0 +1,109 @@
+from collections import defaultdict
+from pathlib import PurePosixPath
+from typing import Dict, List, Set, Tuple
+from src.services.git_service import GitService
+
+MAX_GROUP_SIZE = 20
+CO_CHANGE_COMMITS = 200
+CO_CHANGE_MIN = 2
+SIMILARITY_THRESHOLD = 0.5
+COMMON_LINE_LIMIT = 50
+
+class CommitGrouper:
+    def __init__(self, git_service: GitService, max_group_size: int = MAX_GROUP_SIZE):
+        self.git_service = git_service
+        self.max_group_size = max_group_size
+
+    def group(self, files: List[Tuple[str, str]], diffs: Dict[str, str]) -> List[List[Tuple[str, str]]]:
+        self._parent = list(range(len(files)))
+        self._size = [1] * len(files)
+        index = {file_path: i for i, (file_path, _) in enumerate(files)}
+
+        # Deletions and renames get canned messages, so they are only ever
+        # grouped with their own kind. A conflicted file fails on its own, so
+        # each one gets a kind of its own and never drags clean files down with it.
+        kinds = [('U', i) if change_type == 'U' else change_type if change_type in ('D', 'R') else 'M'
+                 for i, (_, change_type) in enumerate(files)]
+
+        by_directory = defaultdict(list)
+        for i, (file_path, _) in enumerate(files):
+            by_directory[(str(PurePosixPath(file_path).parent), kinds[i])].append(i)
+        for members in by_directory.values():
+            for i in members[1:]:
+                self._union(members[0], i)
+
+        for a, b in self._co_changed_pairs(index):
+            if kinds[a] == kinds[b]:
+                self._union(a, b)
+
+        for a, b in self._similar_pairs(files, diffs):
+            if kinds[a] == kinds[b]:
+                self._union(a, b)
+
+        groups: Dict[int, List[Tuple[str, str]]] = {}
+        for i, entry in enumerate(files):
+            groups.setdefault(self._find(i), []).append(entry)
+        return list(groups.values())
+
+    def _co_changed_pairs(self, index: Dict[str, int]) -> List[Tuple[int, int]]:
+        try:
+            log = self.git_service.repo.git.log(
+                f'-n{CO_CHANGE_COMMITS}', '--name-only', '--no-renames', '--format=%x1e'
+            )
+        except Exception as e:
+            print(f"Error reading co-change history: {str(e)}")
+            return []
+
+        counts = defaultdict(int)
+        for commit in log.split('\x1e'):
+            touched = sorted({index[path] for path in commit.split('\n') if path in index})
+            if len(touched) > self.max_group_size:
+                continue
+            for n, a in enumerate(touched):
+                for b in touched[n + 1:]:
+                    counts[(a, b)] += 1
+        return [pair for pair, count in counts.items() if count >= CO_CHANGE_MIN]
+
+    def _similar_pairs(self, files: List[Tuple[str, str]], diffs: Dict[str, str]) -> List[Tuple[int, int]]:
+        changed: List[Set[str]] = [_changed_lines(diffs.get(file_path, '')) for file_path, _ in files]
+        holders = defaultdict(list)
+        for i, lines in enumerate(changed):
+            for line in lines:
+                holders[line].append(i)
+
+        shared = defaultdict(int)
+        for members in holders.values():
+            if len(members) > COMMON_LINE_LIMIT:
+                continue
+            for n, a in enumerate(members):
+                for b in members[n + 1:]:
+                    shared[(a, b)] += 1
+
+        return [(a, b) for (a, b), count in shared.items()
+                if count / (len(changed[a]) + len(changed[b]) - count) >= SIMILARITY_THRESHOLD]
+
+    def _find(self, i: int) -> int:
+        while self._parent[i] != i:
+            self._parent[i] = self._parent[self._parent[i]]
+            i = self._parent[i]
+        return i
+
+    def _union(self, a: int, b: int) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b or self._size[root_a] + self._size[root_b] > self.max_group_size:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+
+
+def _changed_lines(diff: str) -> Set[str]:
+    lines = set()
+    for line in diff.splitlines():
+        if line.startswith(('+++', '---')) or not line.startswith(('+', '-')):
+            continue
+        text = line[1:].strip()
+        if len(text) > 3:
+            lines.add(line[0] + text)
+    return lines
@@ -0,0 +1,235 @@
+import threading
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from src.services.git_service import GitService
+from src.services.openai_service import OpenAIService, DEFAULT_MAX_DIFF_CHARS, truncate_diff
+from src.services.commit_engine import CommitEngine
+from src.services.commit_grouper import CommitGrouper
+from src.services.commit_rules import RuleClassifier, join_names, rule_message
+
+MAX_NAMES_IN_MESSAGE = 3
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_BATCH_SIZE = 8
+BATCH_ENTRY_CHARS = 1500
+
+
+class CommitPipeline:
+    def __init__(self, git_service: GitService, openai_service: OpenAIService,
+                 files: List[Tuple[str, str]], language: str, max_workers: Optional[int] = None,
+                 context_lines: int = 3, max_diff_chars: Optional[int] = None,
+                 use_cache: bool = True, group_files: bool = False, use_rules: bool = True,
+                 stream: bool = False, batch_size: int = 1, dry_run: bool = False,
+                 on_grouped: Optional[Callable[[List[List[str]]], None]] = None,
+                 on_generated: Optional[Callable[[List[str], str], None]] = None,
+                 on_token: Optional[Callable[[List[str], str], None]] = None,
+                 on_committed: Optional[Callable[[List[str], str], None]] = None,
+                 on_error: Optional[Callable[[str], None]] = None):
+        self.git_service = git_service
+        self.openai_service = openai_service
+        self.files = files
+        self.language = language
+        # The scheduler decides how many requests are in flight; the pool only
+        # has to be large enough for it to reach its ceiling.
+        scheduler = getattr(openai_service, 'scheduler', None)
+        self.max_workers = max(1, max_workers or (scheduler.max_concurrency if scheduler else DEFAULT_MAX_WORKERS))
+        self.context_lines = context_lines
+        self.max_diff_chars = max_diff_chars
+        self.use_cache = use_cache
+        self.group_files = group_files
+        self.classifier = RuleClassifier() if use_rules else None
+        self.stream = stream
+        self.batch_size = max(1, batch_size)
+        self.dry_run = dry_run
+        self.diffs: Dict[str, str] = {}
+        self.groups: List[List[Tuple[str, str]]] = []
+        self.messages: List[Tuple[List[str], str]] = []
+        self.committed: List[Tuple[List[str], str, str]] = []
+        self.on_grouped = on_grouped
+        self.on_generated = on_generated
+        self.on_token = on_token
+        self.on_committed = on_committed
+        self.on_error = on_error
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self):
+        self.diffs = self.git_service.get_diffs(
+            [file_path for file_path, change_type in self.files if change_type not in ('D', 'R', 'U')],
+            self.context_lines
+        )
+
+        if self.group_files:
+            self.groups = CommitGrouper(self.git_service).group(self.files, self.diffs)
+        else:
+            self.groups = [[entry] for entry in self.files]
+        self._notify(self.on_grouped, [_paths(group) for group in self.groups])
+
+        # LLM requests run concurrently; this thread is the single git writer
+        # and applies commits strictly in the order the files were selected.
+        engine_context = nullcontext() if self.dry_run else CommitEngine(self.git_service)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, engine_context as engine:
+            futures = self._submit(executor)
+
+            try:
+                for group, future in zip(self.groups, futures):
+                    if self.is_cancelled():
+                        break
+                    names = ", ".join(_paths(group))
+                    try:
+                        commit_message = future.result()
+                        if self.is_cancelled():
+                            break
+
+                        self.messages.append((_paths(group), commit_message))
+                        if self.dry_run:
+                            continue
+
+                        commit = engine.commit(group, commit_message)
+                        if not commit:
+                            raise Exception(f"Failed to commit {names}")
+
+                        self.committed.append((_paths(group), commit_message, commit))
+                        self._notify(self.on_committed, _paths(group), commit_message)
+
+                    except Exception as e:
+                        self._notify(self.on_error, f"Error processing {names}: {str(e)}")
+                        continue
+
+                if self.is_cancelled():
+                    for future in futures:
+                        future.cancel()
+            except BaseException:
+                # Ctrl-C and the like: requests still queued are dropped now
+                # instead of being sent while the executor shuts down.
+                self._cancelled.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _submit(self, executor: ThreadPoolExecutor) -> List[Future]:
+        if self.batch_size <= 1:
+            return [executor.submit(self._generate, group) for group in self.groups]
+
+        # Small diffs share one request; anything larger keeps its own.
+        budget = self.max_diff_chars or DEFAULT_MAX_DIFF_CHARS
+        futures: List[Future] = []
+        batch: List[Tuple[List[Tuple[str, str]], Future]] = []
+        batch_chars = 0
+        for group in self.groups:
+            size = len(self._group_diff(group)) if self._batchable(group) else None
+            if size is None or size > BATCH_ENTRY_CHARS:
+                futures.append(executor.submit(self._generate, group))
+                continue
+
+            if batch and (len(batch) >= self.batch_size or batch_chars + size > budget):
+                executor.submit(self._generate_batch, batch)
+                batch, batch_chars = [], 0
+            future = Future()
+            futures.append(future)
+            batch.append((group, future))
+            batch_chars += size
+
+        if batch:
+            executor.submit(self._generate_batch, batch)
+        return futures
+
+    def _generate(self, group: List[Tuple[str, str]]) -> str:
+        if self.is_cancelled():
+            return ""
+
+        commit_message = self._local_message(group) or self._generate_with_llm(group)
+        self._notify(self.on_generated, _paths(group), commit_message)
+        return commit_message
+
+    def _generate_batch(self, batch: List[Tuple[List[Tuple[str, str]], Future]]):
+        live = [(group, future) for group, future in batch if future.set_running_or_notify_cancel()]
+        try:
+            remote = {}
+            for n, (group, future) in enumerate(live):
+                commit_message = "" if self.is_cancelled() else self._local_message(group)
+                if commit_message is None:
+                    remote[str(n)] = (group, future)
+                else:
+                    future.set_result(commit_message)
+                    if commit_message:
+                        self._notify(self.on_generated, _paths(group), commit_message)
+
+            answers = {}
+            if remote and not self.is_cancelled():
+                answers = self.openai_service.generate_commit_messages(
+                    {key: self._group_diff(group) for key, (group, _) in remote.items()},
+                    self.language, self.max_diff_chars, use_cache=self.use_cache
+                )
+            for key, (group, future) in remote.items():
+                if self.is_cancelled():
+                    future.set_result("")
+                    continue
+                commit_message = answers.get(key) or self._fallback_message(group)
+                self._notify(self.on_generated, _paths(group), commit_message)
+                future.set_result(commit_message)
+        except Exception as e:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _batchable(self, group: List[Tuple[str, str]]) -> bool:
+        change_types = {change_type for _, change_type in group}
+        return 'U' not in change_types and change_types != {'D'} and change_types != {'R'}
+
+    def _local_message(self, group: List[Tuple[str, str]]) -> Optional[str]:
+        change_types = {change_type for _, change_type in group}
+        if 'U' in change_types:
+            raise Exception("Resolve the merge conflict before committing")
+
+        if change_types == {'D'}:
+            return rule_message('remove', 'remove', self._names(group), self.language)
+        if change_types == {'R'}:
+            return rule_message('rename', 'rename', self._names(group), self.language)
+
+        rule = self.classifier.classify(group, self.diffs) if self.classifier else None
+        return rule_message(*rule, self._names(group), self.language) if rule else None
+
+    def _fallback_message(self, group: List[Tuple[str, str]]) -> str:
+        return rule_message('chore', 'update', self._names(group), self.language)
+
+    def _names(self, group: List[Tuple[str, str]]) -> str:
+        return join_names([Path(file_path).name for file_path, _ in group], self.language, MAX_NAMES_IN_MESSAGE)
+
+    def _group_diff(self, group: List[Tuple[str, str]]) -> str:
+        budget = self.max_diff_chars or DEFAULT_MAX_DIFF_CHARS
+        parts = []
+        for file_path, _ in group:
+            diff = self.diffs.get(file_path) or f"Update {Path(file_path).name}\n"
+            # Split the budget so every file in a group is represented.
+            parts.append(truncate_diff(diff, max(budget // len(group), 200)))
+        return "".join(parts)
+
+    def _generate_with_llm(self, group: List[Tuple[str, str]]) -> str:
+        on_token = None
+        if self.stream and self.on_token:
+            def on_token(text: str):
+                self._notify(self.on_token, _paths(group), text)
+
+        commit_message = self.openai_service.generate_commit_message(
+            self._group_diff(group), self.language, self.max_diff_chars, use_cache=self.use_cache,
+            on_token=on_token
+        )
+        return commit_message or self._fallback_message(group)
+
+    def rule_stats(self) -> Dict[str, int]:
+        return self.classifier.stats() if self.classifier else {}
+
+    def _notify(self, callback: Optional[Callable], *args):
+        if callback:
+            callback(*args)
+
+
+def _paths(group: List[Tuple[str, str]]) -> List[str]:
+    return [file_path for file_path, _ in group]
+
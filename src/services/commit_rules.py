@@ -0,0 +1,227 @@
+import re
+import threading
+from collections import Counter
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional, Tuple
+from src.services.openai_service import COMMIT_TYPES
+
+LOCKFILES = {
+    'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
+    'poetry.lock', 'Pipfile.lock', 'pdm.lock', 'uv.lock', 'Cargo.lock', 'go.sum',
+    'composer.lock', 'Gemfile.lock', 'packages.lock.json', 'pubspec.lock', 'mix.lock'
+}
+
+MANIFESTS = {
+    'package.json', 'pyproject.toml', 'Pipfile', 'Cargo.toml', 'go.mod', 'composer.json',
+    'Gemfile', 'pubspec.yaml'
+}
+
+REQUIREMENTS_FILE = re.compile(r'^(requirements|constraints)([-_.][\w.-]*)?\.(txt|in)$')
+
+GENERATED_FILE = re.compile(
+    r'(\.min\.(js|css)|\.map|_pb2(_grpc)?\.pyi?|\.pb\.go|\.pb\.(cc|h)|\.g\.dart|\.designer\.cs|'
+    r'\.generated\.\w+|\.snap)$'
+)
+
+GENERATED_MARKER = re.compile(r'@generated|DO NOT EDIT|auto-?generated', re.I)
+
+DEPENDENCY_LINE = re.compile(
+    r'^('
+    r'[A-Za-z0-9_.\-]+(\[[\w,\s\-]+\])?\s*(([<>=!~]=?|===)\s*[\w.*+\-]+\s*,?\s*)*(;.*)?'  # requirements
+    r'|"[@\w./\-]+"\s*:\s*"[\^~<>=v\s]*\d[\w.\-+ <>=|^~*]*",?'                          # package.json
+    r'|[\w.\-"]+\s*=\s*("[\^~<>=!\s]*\d[^"]*"|\{.*version.*\}),?'                     # toml
+    r'|"[A-Za-z0-9_.\-]+(\[[\w,\-]+\])?\s*([<>=!~]=?|===)[^"]*",?'                     # toml arrays
+    r'|(require\s+)?[\w.\-/]+\s+v\d[\w.\-+]*(\s*//.*)?'                                 # go.mod
+    r')$'
+)
+
+# A manifest's own identity is not a dependency: `"version": "1.2.3"` in
+# package.json or `version = "0.2.0"` in pyproject.toml is a release bump.
+OWN_MANIFEST_KEY = re.compile(r'^"?(version|name)"?\s*(:|=(?!=))')
+
+IMPORT_LINE = re.compile(
+    r'^(import\s+[\w.,\s]+(\s+as\s+\w+)?'
+    r'|from\s+[\w.]+\s+import\s+.+'
+    r'|import\s+.+\s+from\s+[\'"][^\'"]+[\'"];?'
+    r'|import\s+[\'"][^\'"]+[\'"];?'
+    r'|import\s+(static\s+)?[\w.]+(\.\*)?;'
+    r'|(const|let|var)\s+[\w{}\s,]+=\s*require\([\'"][^\'"]+[\'"]\);?'
+    r'|using\s+[\w.]+;)$'
+)
+
+# Files where indentation is syntax; a whitespace change there can change meaning.
+INDENT_SENSITIVE_SUFFIXES = {'.py', '.pyi', '.pyw', '.yaml', '.yml', '.mk', '.sass', '.haml', '.pug', '.coffee'}
+INDENT_SENSITIVE_NAMES = {'Makefile', 'makefile', 'GNUmakefile'}
+
+STRING_LITERAL = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`')
+
+# Every rule maps to one of the conventional types the LLM prompt uses
+# (COMMIT_TYPES), and its subject is written in the same languages.
+RULE_TYPES: Dict[str, str] = {
+    'lockfile': 'deps',
+    'version_bump': 'deps',
+    'whitespace': 'style',
+    'imports': 'style',
+    'generated': 'chore',
+    'binary': 'chore',
+}
+
+# Subjects in the commit message language; 'update' covers mixed rules of one
+# type and the generic fallback, 'remove'/'rename' the canned D/R messages.
+RULE_MESSAGES: Dict[str, Dict[str, str]] = {
+    'en': {
+        'lockfile': 'update {names}',
+        'version_bump': 'update {names}',
+        'whitespace': 'format {names}',
+        'imports': 'reorder imports in {names}',
+        'generated': 'regenerate {names}',
+        'binary': 'update {names}',
+        'update': 'update {names}',
+        'remove': '{names}',
+        'rename': '{names}',
+        'more': '{names} and {count} more',
+    },
+    'ko': {
+        'lockfile': '{names} 잠금 파일 업데이트',
+        'version_bump': '{names} 종속성 버전 업데이트',
+        'whitespace': '{names} 코드 포맷팅',
+        'imports': '{names} import 정렬',
+        'generated': '{names} 재생성',
+        'binary': '{names} 업데이트',
+        'update': '{names} 업데이트',
+        'remove': '{names}',
+        'rename': '{names}',
+        'more': '{names} 외 {count}개',
+    },
+}
+
+
+def _messages(language: str) -> Dict[str, str]:
+    return RULE_MESSAGES[language if language in COMMIT_TYPES else 'en']
+
+
+def rule_message(commit_type: str, rule: str, names: str, language: str) -> str:
+    messages = _messages(language)
+    return f"{commit_type}: {messages[rule].format(names=names)}"
+
+
+def join_names(names: List[str], language: str, limit: int) -> str:
+    if len(names) <= limit:
+        return ", ".join(names)
+    return _messages(language)['more'].format(names=", ".join(names[:limit]), count=len(names) - limit)
+
+
+class RuleClassifier:
+    def __init__(self):
+        self.hits: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def classify(self, group: List[Tuple[str, str]], diffs: Dict[str, str]) -> Optional[Tuple[str, str]]:
+        rules = [self._classify_file(file_path, diffs.get(file_path, '')) for file_path, _ in group]
+
+        with self._lock:
+            if None in rules:
+                self.hits['llm'] += len(group)
+                return None
+            self.hits.update(rules)
+
+        kinds = set(rules)
+        if len(kinds) == 1:
+            rule = kinds.pop()
+            return RULE_TYPES[rule], rule
+        # Mixed rules within one type, e.g. a lockfile next to its manifest.
+        types = {RULE_TYPES[rule] for rule in kinds}
+        return (types.pop(), 'update') if len(types) == 1 else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.hits)
+
+    def _classify_file(self, file_path: str, diff: str) -> Optional[str]:
+        name = PurePosixPath(file_path).name
+        if name in LOCKFILES:
+            return 'lockfile'
+        if GENERATED_FILE.search(name):
+            return 'generated'
+        if not diff:
+            return None
+
+        removed, added, header = _changed_lines(diff)
+        if not removed and not added:
+            return 'binary' if 'Binary files' in header else None
+
+        if GENERATED_MARKER.search(_leading_lines(diff)):
+            return 'generated'
+        if (name in MANIFESTS or REQUIREMENTS_FILE.match(name)) and _all_match(DEPENDENCY_LINE, removed + added) \
+                and not (name in MANIFESTS and _any_match(OWN_MANIFEST_KEY, removed + added)):
+            return 'version_bump'
+        if _all_match(IMPORT_LINE, removed + added) and Counter(_strip(removed)) == Counter(_strip(added)):
+            return 'imports'
+        if _indent_sensitive(file_path):
+            return None
+        # Identical lines on both sides mean code was moved, not reformatted.
+        if removed != added and _normalize(removed) == _normalize(added):
+            return 'whitespace'
+        return None
+
+
+def _changed_lines(diff: str) -> Tuple[List[str], List[str], str]:
+    removed, added, header = [], [], []
+    in_hunk = False
+    for line in diff.splitlines():
+        if line.startswith('@@'):
+            in_hunk = True
+        elif not in_hunk:
+            header.append(line)
+        elif line.startswith('-'):
+            removed.append(line[1:])
+        elif line.startswith('+'):
+            added.append(line[1:])
+    return removed, added, "\n".join(header)
+
+
+def _leading_lines(diff: str) -> str:
+    # Only a hunk that starts at the top of the file can show a generated-file
+    # header; anything later is ordinary content mentioning the marker.
+    match = re.search(r'^@@ -[01](,\d+)? \+1(,\d+)? @@.*\n((?:[ +].*\n?){0,10})', diff, re.M)
+    return match.group(3) if match else ''
+
+
+def _all_match(pattern: re.Pattern, lines: List[str]) -> bool:
+    meaningful = [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+    return bool(meaningful) and all(pattern.match(line) for line in meaningful)
+
+
+def _any_match(pattern: re.Pattern, lines: List[str]) -> bool:
+    return any(pattern.match(line.strip()) for line in lines)
+
+
+def _indent_sensitive(file_path: str) -> bool:
+    path = PurePosixPath(file_path)
+    return path.name in INDENT_SENSITIVE_NAMES or path.suffix.lower() in INDENT_SENSITIVE_SUFFIXES
+
+
+def _normalize(lines: List[str]) -> List[str]:
+    return [normalized for normalized in (_normalize_line(line) for line in lines) if normalized]
+
+
+def _normalize_line(line: str) -> str:
+    # String literals are kept verbatim; between them, runs of whitespace
+    # collapse and spaces around punctuation go, so `f(a,b)` equals `f( a, b )`
+    # but `int a` never equals `inta`.
+    parts = []
+    pos = 0
+    for match in STRING_LITERAL.finditer(line):
+        parts.append(_normalize_code(line[pos:match.start()]))
+        parts.append(match.group())
+        pos = match.end()
+    parts.append(_normalize_code(line[pos:]))
+    return "".join(parts).strip()
+
+
+def _normalize_code(code: str) -> str:
+    return re.sub(r' ?([^\w\s]) ?', r'\1', re.sub(r'\s+', ' ', code))
+
+
+def _strip(lines: List[str]) -> List[str]:
+    return [line.strip() for line in lines if line.strip()]
@@ -0,0 +1,110 @@
+import codecs
+import mmap
+import os
+from typing import NamedTuple, Optional
+
+SNIFF_BYTES = 8192
+MAX_TEXT_BYTES = 1024 * 1024
+LFS_POINTER_PREFIX = b'version https://git-lfs.github.com/spec/v1'
+TEXT_ENCODINGS = ['utf-8', 'cp949']
+
+MAGIC_TYPES = [
+    (b'\x89PNG\r\n\x1a\n', 'PNG image'),
+    (b'\xff\xd8\xff', 'JPEG image'),
+    (b'GIF87a', 'GIF image'),
+    (b'GIF89a', 'GIF image'),
+    (b'%PDF', 'PDF document'),
+    (b'PK\x03\x04', 'ZIP archive'),
+    (b'\x1f\x8b', 'gzip archive'),
+    (b'\xfd7zXZ\x00', 'xz archive'),
+    (b'7z\xbc\xaf\x27\x1c', '7z archive'),
+    (b'\x7fELF', 'ELF binary'),
+    (b'\xcf\xfa\xed\xfe', 'Mach-O binary'),
+    (b'\x00asm', 'WebAssembly module'),
+    (b'SQLite format 3\x00', 'SQLite database'),
+    (b'wOFF', 'WOFF font'),
+    (b'wOF2', 'WOFF2 font'),
+    (b'OggS', 'Ogg media'),
+    (b'fLaC', 'FLAC audio'),
+]
+
+
+class FileInfo(NamedTuple):
+    size: int
+    kind: str
+    encoding: Optional[str] = None
+    description: str = ''
+
+    @property
+    def is_text(self) -> bool:
+        return self.kind == 'text'
+
+
+def sniff_file(path: str, max_text_bytes: int = MAX_TEXT_BYTES) -> Optional[FileInfo]:
+    try:
+        size = os.stat(path).st_size
+        if size == 0:
+            return FileInfo(0, 'text', 'utf-8')
+        with open(path, 'rb') as f:
+            # Only the first page or two is ever mapped in, however large the file is.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                head = view[:SNIFF_BYTES]
+    except (OSError, ValueError):
+        return None
+
+    return classify_head(head, size, max_text_bytes)
+
+
+def classify_head(head: bytes, size: int, max_text_bytes: int = MAX_TEXT_BYTES) -> FileInfo:
+    if head.startswith(LFS_POINTER_PREFIX):
+        return FileInfo(size, 'lfs', 'utf-8', _lfs_description(head))
+
+    for magic, description in MAGIC_TYPES:
+        if head.startswith(magic):
+            return FileInfo(size, 'binary', None, description)
+
+    encoding = detect_encoding(head, complete=size <= len(head))
+    if encoding is None:
+        return FileInfo(size, 'binary', None, 'binary data')
+    if size > max_text_bytes:
+        return FileInfo(size, 'oversized', encoding, f'{encoding} text')
+    return FileInfo(size, 'text', encoding)
+
+
+def detect_encoding(head: bytes, complete: bool = True) -> Optional[str]:
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    if b'\0' in head:
+        return None
+
+    for encoding in TEXT_ENCODINGS:
+        # The sample may end in the middle of a multi-byte character, so a
+        # truncated tail is not treated as a decoding failure.
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(head, final=complete)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def format_size(size: int) -> str:
+    if abs(size) < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ('KB', 'MB'):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def _lfs_description(head: bytes) -> str:
+    fields = dict(
+        line.split(' ', 1) for line in head.decode('utf-8', errors='replace').splitlines() if ' ' in line
+    )
+    size = fields.get('size', '')
+    return f"Git LFS object ({format_size(int(size))})" if size.isdigit() else "Git LFS object"
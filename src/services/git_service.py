@@ -1,12 +1,61 @@
+import codecs
 import git
 import os
-from typing import List, Tuple, Optional
+import re
+import subprocess
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Optional
 from pathlib import Path
+from src.services.file_sniffer import FileInfo, MAX_TEXT_BYTES, format_size, sniff_file
+
+EMPTY_TREE_SHA = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+DIFF_PATHS_PER_CALL = 1000
+STATUS_READ_SIZE = 1 << 16
+
+class PushCancelled(Exception):
+    pass
+
+class PushResult(NamedTuple):
+    flag: str
+    local_ref: str
+    remote_ref: str
+    summary: str
+
+    @property
+    def ok(self) -> bool:
+        return self.flag != '!'
+
+class _PushProgress(git.RemoteProgress):
+    STAGES = {
+        git.RemoteProgress.COUNTING: 'counting',
+        git.RemoteProgress.COMPRESSING: 'compressing',
+        git.RemoteProgress.WRITING: 'writing',
+        git.RemoteProgress.RESOLVING: 'resolving',
+        git.RemoteProgress.FINDING_SOURCES: 'finding',
+    }
+
+    def __init__(self, callback: Optional[Callable[[str, int, int, str], None]]):
+        super().__init__()
+        self.callback = callback
+
+    def update(self, op_code, cur_count, max_count=None, message=''):
+        stage = self.STAGES.get(op_code & self.OP_MASK)
+        if self.callback and stage:
+            self.callback(stage, int(cur_count or 0), int(max_count or 0), message or '')
+
+class StatusEntry(NamedTuple):
+    kind: str
+    path: str
+    index_status: str = '.'
+    worktree_status: str = '.'
+    orig_path: Optional[str] = None
+
 
 class GitService:
     def __init__(self, repo_path: str = None):
         self.repo_path = Path(repo_path).resolve() if repo_path else None
         self.repo = None
+        self._unpushed_cache: Optional[Tuple[str, str, int]] = None
         if repo_path:
             self.init_repo(repo_path)
 
@@ -49,7 +98,7 @@ class GitService:
 
     def stage_file(self, file_path: str, change_type: str) -> bool:
         try:
-            abs_path = Path(file_path).resolve()
+            abs_path = Path(self.get_absolute_path(file_path)).resolve()
             if not str(abs_path).startswith(str(self.repo_path)):
                 raise Exception(f"File path {file_path} is outside repository")
 
@@ -74,60 +123,257 @@ class GitService:
             print(f"Error committing: {str(e)}")
             return False
 
-    def get_unstaged_files(self) -> List[Tuple[str, str, str]]:
+    def get_status(self, cancel_event: Optional[threading.Event] = None) -> List[StatusEntry]:
         if not self.repo:
             return []
-        
-        files = []
+
         try:
-            for item in self.repo.index.diff(None):
-                if item.deleted_file:
-                    files.append((item.a_path, 'deleted', 'D'))
-                else:
-                    files.append((item.a_path, 'modified', 'M'))
-            
-            for item in self.repo.untracked_files:
-                files.append((item, 'untracked', 'A'))
-                
+            return list(self.iter_status(cancel_event))
         except Exception as e:
-            print(f"Error getting unstaged files: {str(e)}")
-            
-        return files
-
-    def get_unpushed_commits(self) -> List[git.Commit]:
-        if not self.repo:
+            if not (cancel_event and cancel_event.is_set()):
+                print(f"Error getting status: {str(e)}")
             return []
-        
+
+    def iter_status(self, cancel_event: Optional[threading.Event] = None) -> Iterator[StatusEntry]:
+        proc = self.repo.git.execute(
+            ['git', '--no-optional-locks', 'status', '--porcelain=v2', '-z',
+             '--untracked-files=all', '--find-renames'],
+            as_process=True
+        )
+        if cancel_event:
+            _watch_cancel(proc, cancel_event)
         try:
-            if not self.repo.remotes:
-                return list(self.repo.iter_commits())
+            records = _split_nul_stream(proc.stdout)
+            for record in records:
+                entry_type = record[:1]
+                if entry_type == '1':
+                    fields = record.split(' ', 8)
+                    yield StatusEntry('changed', fields[8], fields[1][0], fields[1][1])
+                elif entry_type == '2':
+                    fields = record.split(' ', 9)
+                    yield StatusEntry('renamed', fields[9], fields[1][0], fields[1][1],
+                                      next(records, None))
+                elif entry_type == 'u':
+                    fields = record.split(' ', 10)
+                    yield StatusEntry('conflicted', fields[10], fields[1][0], fields[1][1])
+                elif entry_type == '?':
+                    yield StatusEntry('untracked', record[2:], '?', '?')
+        finally:
+            proc.wait()
 
-            remote = self.repo.remote()
-            current_branch = self.get_current_branch()
-            
-            try:
-                tracking_branch = f'{remote.name}/{current_branch}'
-                if tracking_branch not in [ref.name for ref in self.repo.refs]:
-                    return list(self.repo.iter_commits())
-                return list(self.repo.iter_commits(f'{tracking_branch}..{current_branch}'))
-            except git.exc.GitCommandError:
-                return list(self.repo.iter_commits())
+    def get_unstaged_files(self, cancel_event: Optional[threading.Event] = None) -> List[Tuple[str, str, str]]:
+        return [_describe_status(entry) for entry in self.get_status(cancel_event)]
+
+    def get_diffs(self, file_paths: List[str], context_lines: int = 3,
+                  max_text_bytes: int = MAX_TEXT_BYTES) -> Dict[str, str]:
+        if not self.repo or not file_paths:
+            return {}
+
+        base = 'HEAD' if self.repo.head.is_valid() else EMPTY_TREE_SHA
+        # Binary, LFS and oversized files are described by metadata, so their
+        # content is never diffed, decoded or loaded beyond the sniffed head.
+        infos = {file_path: sniff_file(self.get_absolute_path(file_path), max_text_bytes)
+                 for file_path in file_paths}
+        summarized = [file_path for file_path, info in infos.items() if info and not info.is_text]
+        skipped = set(summarized)
+        text_paths = [file_path for file_path in file_paths if file_path not in skipped]
+        encodings = {file_path: info.encoding for file_path, info in infos.items() if info and info.encoding}
+
+        diffs = {}
+        try:
+            for start in range(0, len(text_paths), DIFF_PATHS_PER_CALL):
+                chunk = text_paths[start:start + DIFF_PATHS_PER_CALL]
+                proc = self.repo.git.execute(
+                    ['git', '-c', 'core.quotepath=off', 'diff', base, '--no-color',
+                     '--no-ext-diff', '--no-renames', '--src-prefix=a/', '--dst-prefix=b/',
+                     f'-U{context_lines}', '--', *chunk],
+                    as_process=True,
+                    # File names, not patterns: `*`, `?`, `[` and a leading `:` are literal.
+                    env=dict(os.environ, GIT_LITERAL_PATHSPECS='1')
+                )
+                try:
+                    for path, diff in _split_diff_stream(proc.stdout, encodings):
+                        diffs[path] = diff
+                finally:
+                    proc.wait()
         except Exception as e:
-            print(f"Error getting unpushed commits: {str(e)}")
-            return []
+            print(f"Error getting diffs: {str(e)}")
+
+        if summarized:
+            old_sizes = self._blob_sizes(base, summarized)
+            for file_path in summarized:
+                diffs[file_path] = _summary_diff(file_path, infos[file_path], old_sizes.get(file_path))
 
-    def push(self) -> bool:
+        # Untracked files never show up in `git diff`, so describe them as additions.
+        for file_path in text_paths:
+            if file_path not in diffs:
+                diff = self._new_file_diff(file_path, infos.get(file_path))
+                if diff:
+                    diffs[file_path] = diff
+
+        return diffs
+
+    def _blob_sizes(self, base: str, file_paths: List[str]) -> Dict[str, int]:
+        if base == EMPTY_TREE_SHA:
+            return {}
         try:
-            if not self.repo.remotes:
-                return False
-            remote = self.repo.remote()
-            current_branch = self.get_current_branch()
-            remote.push(refspec=f'{current_branch}:{current_branch}')
-            return True
+            result = subprocess.run(
+                ['git', 'cat-file', '--batch-check=%(objectsize)'],
+                cwd=str(self.repo_path),
+                input="".join(f"{base}:{file_path}\n" for file_path in file_paths).encode('utf-8'),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True
+            )
+        except Exception as e:
+            print(f"Error reading blob sizes: {str(e)}")
+            return {}
+
+        sizes = {}
+        for file_path, line in zip(file_paths, result.stdout.decode('utf-8', errors='replace').splitlines()):
+            if line.isdigit():
+                sizes[file_path] = int(line)
+        return sizes
+
+    def _new_file_diff(self, file_path: str, info: Optional[FileInfo] = None) -> Optional[str]:
+        abs_path = self.get_absolute_path(file_path)
+        if not os.path.isfile(abs_path):
+            return None
+
+        info = info or sniff_file(abs_path)
+        if info is None:
+            return None
+        if not info.is_text:
+            return _summary_diff(file_path, info, None)
+
+        with open(abs_path, 'r', encoding=info.encoding, errors='replace') as f:
+            content = f.read()
+
+        header = f"diff --git a/{file_path} b/{file_path}\nnew file\n"
+        lines = content.splitlines()
+        body = "".join(f"+{line}\n" for line in lines)
+        return header + f"--- /dev/null\n+++ b/{file_path}\n@@ -0,0 +1,{len(lines)} @@\n" + body
+
+    def get_upstream(self) -> Optional[str]:
+        try:
+            return self.repo.git.rev_parse('--abbrev-ref', '--symbolic-full-name', '@{u}')
+        except git.exc.GitCommandError:
+            pass
+
+        if not self.repo.remotes:
+            return None
+        tracking_branch = f'{self.repo.remote().name}/{self.get_current_branch()}'
+        try:
+            self.repo.git.rev_parse('--verify', '-q', f'refs/remotes/{tracking_branch}')
+            return tracking_branch
+        except git.exc.GitCommandError:
+            return None
+
+    def _unpushed_range(self) -> Tuple[List[str], str]:
+        upstream = self.get_upstream()
+        if upstream:
+            return [upstream], self.repo.git.rev_parse(upstream)
+        # Without an upstream, anything not reachable from a remote is unpushed.
+        return ['--remotes'], self.repo.git.for_each_ref('--format=%(objectname)', 'refs/remotes')
+
+    def get_unpushed_count(self) -> int:
+        if not self.repo or not self.repo.head.is_valid():
+            return 0
+
+        try:
+            head = self.repo.head.commit.hexsha
+            exclude, base = self._unpushed_range()
+
+            cached = self._unpushed_cache
+            if cached and cached[1] == base:
+                if cached[0] == head:
+                    return cached[2]
+                if self._is_ancestor(cached[0], head):
+                    count = cached[2] + int(self.repo.git.rev_list('--count', head, '--not', cached[0], *exclude))
+                    self._unpushed_cache = (head, base, count)
+                    return count
+
+            count = int(self.repo.git.rev_list('--count', head, '--not', *exclude))
+            self._unpushed_cache = (head, base, count)
+            return count
         except Exception as e:
-            print(f"Error pushing changes: {str(e)}")
+            print(f"Error counting unpushed commits: {str(e)}")
+            return 0
+
+    def _is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        try:
+            self.repo.git.merge_base('--is-ancestor', ancestor, descendant)
+            return True
+        except git.exc.GitCommandError:
             return False
 
+    def iter_unpushed_commits(self, page_size: int = 100) -> Iterator[List[git.Commit]]:
+        if not self.repo or not self.repo.head.is_valid():
+            return
+
+        exclude, _ = self._unpushed_range()
+        skip = 0
+        while True:
+            page = list(self.repo.iter_commits(['HEAD', '--not', *exclude], max_count=page_size, skip=skip))
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            skip += len(page)
+
+    def get_unpushed_commits(self) -> List[git.Commit]:
+        try:
+            return [commit for page in self.iter_unpushed_commits() for commit in page]
+        except Exception as e:
+            print(f"Error getting unpushed commits: {str(e)}")
+            return []
+
+    def push(self, on_progress: Optional[Callable[[str, int, int, str], None]] = None,
+             cancel_event: Optional[threading.Event] = None) -> List[PushResult]:
+        if not self.repo.remotes:
+            return []
+
+        remote = self.repo.remote()
+        current_branch = self.get_current_branch()
+        progress = _PushProgress(on_progress)
+        handle_line = progress.new_message_handler()
+
+        proc = self.repo.git.execute(
+            ['git', 'push', '--porcelain', '--progress', remote.name,
+             f'{current_branch}:{current_branch}'],
+            as_process=True
+        )
+        cancelled = _watch_cancel(proc, cancel_event) if cancel_event else threading.Event()
+
+        # git rewrites progress lines in place with \r, so split on both.
+        pending = b''
+        for chunk in iter(lambda: proc.stderr.read1(4096), b''):
+            lines = re.split(rb'[\r\n]', pending + chunk)
+            pending = lines.pop()
+            for line in lines:
+                if line:
+                    handle_line(line.decode('utf-8', errors='replace'))
+        if pending:
+            handle_line(pending.decode('utf-8', errors='replace'))
+
+        output = proc.stdout.read().decode('utf-8', errors='replace')
+        proc.proc.wait()
+        if cancelled.is_set():
+            raise PushCancelled("Push was cancelled")
+
+        results = []
+        for line in output.splitlines():
+            fields = line.split('\t')
+            if len(fields) == 3 and ':' in fields[1]:
+                local_ref, remote_ref = fields[1].split(':', 1)
+                results.append(PushResult(fields[0], local_ref, remote_ref, fields[2]))
+
+        if not results:
+            errors = progress.error_lines or progress.other_lines
+            raise Exception("\n".join(errors) or f"git push exited with {proc.proc.returncode}")
+        return results
+
     def has_remote(self) -> bool:
         return bool(self.repo and self.repo.remotes)
 
@@ -152,4 +398,105 @@ class GitService:
     def get_absolute_path(self, file_path: str) -> str:
         if Path(file_path).is_absolute():
             return str(Path(file_path))
-        return str(Path(self.repo_path) / file_path) 
\ No newline at end of file
+        return str(Path(self.repo_path) / file_path)
+
+
+def _watch_cancel(proc, cancel_event: threading.Event) -> threading.Event:
+    # Terminates the git process once cancel_event is set; the returned event
+    # tells whether that happened before the process exited on its own.
+    cancelled = threading.Event()
+
+    def watch():
+        while proc.proc.poll() is None:
+            if cancel_event.wait(0.1):
+                cancelled.set()
+                proc.proc.terminate()
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    return cancelled
+
+
+def _split_diff_stream(stream: Iterable[bytes],
+                       encodings: Optional[Dict[str, str]] = None) -> Iterator[Tuple[str, str]]:
+    path = None
+    encoding = 'utf-8'
+    lines = []
+    for raw in stream:
+        if raw.startswith(b'diff --git '):
+            line = raw.decode('utf-8', errors='replace')
+            if path is not None:
+                yield path, ''.join(lines)
+            path = _parse_diff_header(line.rstrip('\n'))
+            encoding = (encodings or {}).get(path) or 'utf-8'
+            lines = []
+        else:
+            line = raw.decode(encoding, errors='replace')
+        if path is not None:
+            lines.append(line)
+    if path is not None:
+        yield path, ''.join(lines)
+
+
+def _parse_diff_header(line: str) -> Optional[str]:
+    rest = line[len('diff --git '):]
+    if rest.startswith('"'):
+        match = re.match(r'"((?:[^"\\]|\\.)*)"', rest)
+        if not match:
+            return None
+        return _unquote_path(match.group(1))[2:]
+
+    # Without renames both sides are identical: "a/<path> b/<path>".
+    half = (len(rest) - 3) // 2
+    if rest[half + 2:half + 4] == 'b/' and rest[2:half + 1] == rest[half + 4:]:
+        return rest[2:half + 1]
+    return rest.split(' b/', 1)[0][2:]
+
+
+def _unquote_path(quoted: str) -> str:
+    return codecs.escape_decode(quoted.encode('utf-8'))[0].decode('utf-8', errors='replace')
+
+
+def _summary_diff(file_path: str, info: FileInfo, old_size: Optional[int]) -> str:
+    if old_size is None:
+        change = f"added ({format_size(info.size)})"
+    elif info.kind == 'lfs':
+        change = "pointer updated"
+    else:
+        delta = info.size - old_size
+        sign = '+' if delta >= 0 else '-'
+        change = f"{format_size(old_size)} -> {format_size(info.size)} ({sign}{format_size(abs(delta))})"
+
+    header = f"diff --git a/{file_path} b/{file_path}\n"
+    if info.kind == 'oversized':
+        return header + f"Large file {file_path} ({info.description}) not shown: {change}\n"
+    source = "/dev/null" if old_size is None else f"a/{file_path}"
+    return header + f"Binary files {source} and b/{file_path} differ\n{info.description}: {change}\n"
+
+
+def _describe_status(entry: StatusEntry) -> Tuple[str, str, str]:
+    if entry.kind == 'untracked':
+        return (entry.path, 'untracked', 'A')
+    if entry.kind == 'conflicted':
+        return (entry.path, 'conflicted', 'U')
+    if entry.kind == 'renamed':
+        return (entry.path, 'renamed', 'R')
+    if 'D' in (entry.index_status, entry.worktree_status):
+        return (entry.path, 'deleted', 'D')
+    if entry.index_status == 'A':
+        return (entry.path, 'added', 'A')
+    return (entry.path, 'modified', 'M')
+
+
+def _split_nul_stream(stream) -> Iterator[str]:
+    pending = b''
+    while True:
+        chunk = stream.read(STATUS_READ_SIZE)
+        if not chunk:
+            break
+        records = (pending + chunk).split(b'\0')
+        pending = records.pop()
+        for record in records:
+            yield record.decode('utf-8', errors='replace')
+    if pending:
+        yield pending.decode('utf-8', errors='replace')
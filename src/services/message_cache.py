@@ -0,0 +1,107 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+class MessageCache:
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or Path.home() / ".gitcommitmanager" / "message_cache.db"
+        self.path.parent.mkdir(exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                key TEXT PRIMARY KEY,
+                message TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS messages_last_used ON messages (last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @staticmethod
+    def make_key(diff: str, language: str, model: str, prompt_version: str) -> str:
+        # Blob ids and hunk line numbers differ when the same patch lands on
+        # another branch, so they are left out of the content hash.
+        lines = []
+        for line in diff.splitlines():
+            if line.startswith('index '):
+                continue
+            if line.startswith('@@'):
+                line = re.sub(r'^@@ [^@]* @@', '@@', line)
+            lines.append(line)
+
+        digest = hashlib.sha256()
+        for part in (prompt_version, model, language, "\n".join(lines)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT message FROM messages WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("UPDATE messages SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._increment('hits' if row else 'misses')
+        return row[0] if row else None
+
+    def put(self, key: str, message: str) -> None:
+        size = len(key) + len(message.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO messages (key, message, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, message, size, time.time())
+            )
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM messages")
+            self._conn.execute("DELETE FROM counters")
+            self._conn.execute("VACUUM")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM messages"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            'entries': entries,
+            'bytes': total,
+            'hits': counters.get('hits', 0),
+            'misses': counters.get('misses', 0),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _increment(self, name: str) -> None:
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM messages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM messages ORDER BY last_used"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM messages WHERE key = ?", stale)
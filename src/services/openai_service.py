@@ -1,48 +1,103 @@
-import openai
-from typing import Optional, Dict, List
+import json
+import random
+import threading
+import time
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Callable, Optional, Dict, List
 import re
 from datetime import datetime
+from src.services.message_cache import MessageCache
+from src.services.rate_limiter import RateLimitScheduler
+
+if TYPE_CHECKING:
+    import openai
+
+DEFAULT_MAX_DIFF_CHARS = 12000
+MODEL = "gpt-4-turbo-preview"
+PROMPT_VERSION = "2"
+STOP_SEQUENCES = ["\n", "。", ".", "!"]
+SUBJECT_PATTERN = re.compile(r'^[a-z]+(\([^)]+\))?!?: .+$')
+# Text that can still grow into a SUBJECT_PATTERN match.
+SUBJECT_PREFIX = re.compile(r'^[a-z]+(\([^)]+\))?!?: |^[a-z]*(\([^)]*\)?)?!?:?$')
+# Quotes and markdown the model sometimes wraps a subject in.
+LEADING_DECORATION = ' \t`"\'*#>-'
+TRAILING_DECORATION = ' \t`"\'*'
+
+REQUEST_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0
+POOL_SIZE = 16
+KEEPALIVE_EXPIRY = 120.0
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+RETRYABLE_STATUS = (408, 409, 429)
+MAX_COMPLETION_TOKENS = 60
+CHARS_PER_TOKEN = 4
+BATCH_TOKENS_PER_ENTRY = 40
+BATCH_ROUNDS = 2
+
+def truncate_diff(diff: str, max_chars: int) -> str:
+    if len(diff) <= max_chars:
+        return diff
+
+    cut = diff.rfind('\n', 0, max_chars)
+    kept = diff[:cut + 1] if cut > 0 else diff[:max_chars]
+    dropped = diff[len(kept):].count('\n') + 1
+    return kept + f"... ({dropped} more lines truncated)\n"
+
+COMMIT_TYPES = {
+    'en': {
+        'feat': 'Add new feature',
+        'fix': 'Fix a bug',
+        'docs': 'Update documentation',
+        'style': 'Code formatting',
+        'refactor': 'Code refactoring',
+        'test': 'Add or update tests',
+        'chore': 'Update build tasks',
+        'perf': 'Performance improvements',
+        'ci': 'CI/CD changes',
+        'security': 'Security fixes',
+        'deps': 'Dependencies updates',
+        'breaking': 'Breaking changes',
+        'revert': 'Revert changes'
+    },
+    'ko': {
+        'feat': '새로운 기능 추가',
+        'fix': '버그 수정',
+        'docs': '문서 수정',
+        'style': '코드 포맷팅',
+        'refactor': '코드 리팩토링',
+        'test': '테스트 코드 추가',
+        'chore': '빌드 업무 수정',
+        'perf': '성능 개선',
+        'ci': 'CI/CD 변경',
+        'security': '보안 수정',
+        'deps': '종속성 업데이트',
+        'breaking': '주요 변경사항',
+        'revert': '변경사항 되돌리기'
+    }
+}
 
 class OpenAIService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_diff_chars: int = DEFAULT_MAX_DIFF_CHARS,
+                 cache: Optional[MessageCache] = None, base_url: Optional[str] = None,
+                 client: Optional['openai.OpenAI'] = None, max_retries: int = MAX_RETRIES,
+                 timeout: float = REQUEST_TIMEOUT, scheduler: Optional[RateLimitScheduler] = None):
         if not isinstance(api_key, str) or not api_key.strip():
             raise ValueError("API key must be a non-empty string")
             
         self.api_key = api_key
-        openai.api_key = api_key
+        self.max_diff_chars = max_diff_chars
+        self.cache = cache
+        self.max_retries = max_retries
+        self.scheduler = scheduler or RateLimitScheduler()
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'timeouts': 0,
+                       'rate_limited': 0, 'connections': 0, 'sent': 0}
+        self._stats_lock = threading.Lock()
+        self._http_client = None
+        self.client = client or self._create_client(base_url, timeout)
         
-        self.commit_types = {
-            'en': {
-                'feat': 'Add new feature',
-                'fix': 'Fix a bug',
-                'docs': 'Update documentation',
-                'style': 'Code formatting',
-                'refactor': 'Code refactoring',
-                'test': 'Add or update tests',
-                'chore': 'Update build tasks',
-                'perf': 'Performance improvements',
-                'ci': 'CI/CD changes',
-                'security': 'Security fixes',
-                'deps': 'Dependencies updates',
-                'breaking': 'Breaking changes',
-                'revert': 'Revert changes'
-            },
-            'ko': {
-                'feat': '새로운 기능 추가',
-                'fix': '버그 수정',
-                'docs': '문서 수정',
-                'style': '코드 포맷팅',
-                'refactor': '코드 리팩토링',
-                'test': '테스트 코드 추가',
-                'chore': '빌드 업무 수정',
-                'perf': '성능 개선',
-                'ci': 'CI/CD 변경',
-                'security': '보안 수정',
-                'deps': '종속성 업데이트',
-                'breaking': '주요 변경사항',
-                'revert': '변경사항 되돌리기'
-            }
-        }
+        self.commit_types = COMMIT_TYPES
 
     def _analyze_code(self, content: str) -> List[str]:
         patterns = {
@@ -55,16 +110,133 @@ class OpenAIService:
         return [key for key, pattern in patterns.items() 
                 if re.search(pattern, content, re.I)]
 
-    def generate_commit_message(self, file_content: str, language: str = 'en') -> Optional[str]:
-        if not isinstance(file_content, str) or not file_content.strip():
-            raise ValueError("File content must be a non-empty string")
+    def generate_commit_message(self, diff: str, language: str = 'en',
+                                max_chars: Optional[int] = None,
+                                use_cache: bool = True,
+                                on_token: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        if not isinstance(diff, str) or not diff.strip():
+            raise ValueError("Diff must be a non-empty string")
         
         if language not in self.commit_types:
             raise ValueError(f"Unsupported language: {language}")
 
-        indicators = self._analyze_code(file_content)
-        
-        prompt = f"""As a senior developer, generate a precise git commit message.
+        diff = truncate_diff(diff, max_chars or self.max_diff_chars)
+
+        cache_key = None
+        if self.cache and use_cache:
+            cache_key = MessageCache.make_key(diff, language, MODEL, PROMPT_VERSION)
+            cached = self.cache.get(cache_key)
+            if cached:
+                return cached
+
+        prompt = self._system_prompt(diff, language)
+
+        try:
+            messages = [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": diff}
+            ]
+            if on_token:
+                message = _clean_message(self._stream_first_line(messages, on_token) or "")
+            else:
+                response = self._create(messages=messages)
+                if not response.choices:
+                    return None
+                message = _clean_message(response.choices[0].message.content or "")
+            # Asking again with the same prompt rarely fixes a bad subject; the
+            # caller falls back to a local message instead.
+            if not message:
+                return None
+
+            if cache_key:
+                self.cache.put(cache_key, message)
+            return message
+            
+        except Exception as e:
+            print(f"Error generating commit message: {str(e)}")
+            return None
+
+    def generate_commit_messages(self, diffs: Dict[str, str], language: str = 'en',
+                                 max_chars: Optional[int] = None,
+                                 use_cache: bool = True) -> Dict[str, Optional[str]]:
+        if language not in self.commit_types:
+            raise ValueError(f"Unsupported language: {language}")
+
+        results: Dict[str, Optional[str]] = {}
+        pending: Dict[str, str] = {}
+        cache_keys: Dict[str, str] = {}
+        for key, diff in diffs.items():
+            if not isinstance(diff, str) or not diff.strip():
+                results[key] = None
+                continue
+            diff = truncate_diff(diff, max_chars or self.max_diff_chars)
+            if self.cache and use_cache:
+                cache_keys[key] = MessageCache.make_key(diff, language, MODEL, PROMPT_VERSION)
+                cached = self.cache.get(cache_keys[key])
+                if cached:
+                    results[key] = cached
+                    continue
+            pending[key] = diff
+
+        # Entries are validated one by one; only the ones that came back
+        # missing or malformed go into the next round.
+        for _ in range(BATCH_ROUNDS):
+            if not pending:
+                break
+            try:
+                answers = self._request_batch(pending, language)
+            except Exception as e:
+                print(f"Error generating commit messages: {str(e)}")
+                break
+
+            for key in list(pending):
+                message = _clean_message(answers.get(key) or "")
+                if message:
+                    results[key] = message
+                    del pending[key]
+                    if key in cache_keys:
+                        self.cache.put(cache_keys[key], message)
+
+        for key in pending:
+            results[key] = None
+        return results
+
+    def _request_batch(self, diffs: Dict[str, str], language: str) -> Dict[str, str]:
+        ids = {str(n): key for n, key in enumerate(diffs, 1)}
+        combined = "".join(f"### id: {n}\n{diffs[key]}\n" for n, key in ids.items())
+        prompt = self._system_prompt(combined, language) + f"""
+The input holds {len(ids)} diffs, each introduced by a "### id: <id>" line.
+Write one commit message per diff and answer with a JSON object only:
+{{"messages": {{"<id>": "<type>: <description>", ...}}}}
+"""
+        response = self._create(
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": combined}
+            ],
+            sampling={
+                'max_tokens': BATCH_TOKENS_PER_ENTRY * len(ids) + 20,
+                'temperature': 0.4,
+                'response_format': {'type': 'json_object'}
+            }
+        )
+        if not response.choices:
+            return {}
+
+        try:
+            answer = json.loads(response.choices[0].message.content or "{}")
+        except ValueError:
+            return {}
+        messages = answer.get('messages') if isinstance(answer, dict) else None
+        if not isinstance(messages, dict):
+            return {}
+        return {ids[n]: message for n, message in messages.items() if n in ids and isinstance(message, str)}
+
+    def _system_prompt(self, diff: str, language: str) -> str:
+        indicators = self._analyze_code(diff)
+        types = "\n".join([f"{k}: {v}" for k, v in self.commit_types[language].items()])
+
+        return f"""As a senior developer, generate a precise git commit message for the unified diff below.
 
 Rules:
 <type>: <description>
@@ -74,34 +246,181 @@ Use imperative mood
 No punctuation at end
 
 Types:
-{"\n".join([f"{k}: {v}" for k, v in self.commit_types[language].items()])}
+{types}
 
 Analysis: {", ".join(indicators) if indicators else "none"}
 """
 
+    def _create_client(self, base_url: Optional[str], timeout: float) -> 'openai.OpenAI':
+        # The SDK is by far the heaviest import in the app, so it is only
+        # loaded once a client is actually needed.
+        import openai
+        httpx = _http_module()
+
+        # One keep-alive pool shared by every worker thread; retries are
+        # done here rather than by the SDK so they can be counted and jittered.
+        self._http_client = openai.DefaultHttpxClient(
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE,
+                                keepalive_expiry=KEEPALIVE_EXPIRY),
+            event_hooks={'request': [self._trace_connections], 'response': [self._observe_limits]}
+        )
+        return openai.OpenAI(
+            api_key=self.api_key,
+            base_url=base_url or None,
+            timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT),
+            max_retries=0,
+            http_client=self._http_client
+        )
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['reused'] = max(0, stats['sent'] - stats['connections'])
+        stats['scheduler'] = self.scheduler.stats()
+        return stats
+
+    def close(self):
+        if self._http_client:
+            self._http_client.close()
+
+    def _create(self, sampling: Optional[Dict] = None, **kwargs):
+        import openai
+
+        self._count('requests')
+        sampling = sampling or self._sampling()
+        estimate = sum(len(m['content']) for m in kwargs.get('messages', [])) // CHARS_PER_TOKEN
+        estimate += sampling.get('max_tokens', MAX_COMPLETION_TOKENS)
+        attempt = 0
+        while True:
+            try:
+                with ExitStack() as slot:
+                    slot.enter_context(self.scheduler.slot(estimate))
+                    response = self.client.chat.completions.create(model=MODEL, **sampling, **kwargs)
+                    if kwargs.get('stream'):
+                        # The body is still being generated, so the request
+                        # keeps its slot until the stream is read or closed.
+                        response = _SlotStream(response, slot.pop_all())
+                self.scheduler.on_success()
+                return response
+            except openai.APIError as e:
+                if isinstance(e, openai.APITimeoutError):
+                    self._count('timeouts')
+                rate_limited = isinstance(e, openai.RateLimitError)
+                if rate_limited:
+                    self._count('rate_limited')
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    self._count('failures')
+                    raise
+
+                delay = _retry_delay(e, attempt)
+                if rate_limited:
+                    # Pausing the scheduler holds back every worker, not just this one.
+                    self.scheduler.on_rate_limited(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+                self._count('retries')
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _observe_limits(self, response):
+        self.scheduler.observe(response.headers)
+
+    def _trace_connections(self, request):
+        def trace(event: str, info: dict):
+            if event == 'connection.connect_tcp.complete':
+                self._count('connections')
+            elif event.endswith('send_request_headers.started'):
+                self._count('sent')
+
+        request.extensions['trace'] = trace
+
+    def _sampling(self) -> Dict:
+        return {
+            'max_tokens': MAX_COMPLETION_TOKENS,
+            'temperature': 0.4,
+            'presence_penalty': 0.2,
+            'frequency_penalty': 0.3,
+            'top_p': 0.95,
+            'stop': STOP_SEQUENCES
+        }
+
+    def _stream_first_line(self, messages: List[Dict], on_token: Callable[[str], None]) -> Optional[str]:
+        # The "\n" stop sequence already ends the completion after the subject
+        # line; the stream is only abandoned early once it cannot be a subject.
+        stream = self._create(messages=messages, stream=True)
+        text = ""
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": file_content}
-                ],
-                max_tokens=60,
-                temperature=0.4,
-                presence_penalty=0.2,
-                frequency_penalty=0.3,
-                top_p=0.95,
-                stop=["\n", "。", ".", "!"]
-            )
-            
-            if not response.choices:
-                return None
-                
-            message = response.choices[0].message.content.strip()
-            message = re.sub(r'[.!？。]+$', '', message).lower()
-            
-            return message if re.match(r'^[a-z]+(\([^)]+\))?!?: .+$', message) else None
-            
-        except Exception as e:
-            print(f"Error generating commit message: {str(e)}")
-            return None
\ No newline at end of file
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text += chunk.choices[0].delta.content or ""
+                if not SUBJECT_PREFIX.match(text.lstrip(LEADING_DECORATION).lower()):
+                    return None
+                on_token(text)
+        finally:
+            stream.close()
+        return text
+
+
+class _SlotStream:
+    def __init__(self, stream, slot: ExitStack):
+        self._stream = stream
+        self._slot = slot
+
+    def __iter__(self):
+        try:
+            yield from self._stream
+        finally:
+            self.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._slot.close()
+
+
+def _clean_message(text: str) -> Optional[str]:
+    line = text.strip().split('\n', 1)[0].lstrip(LEADING_DECORATION).rstrip(TRAILING_DECORATION)
+    message = re.sub(r'[.!？。]+$', '', line).lower()
+    return message if SUBJECT_PATTERN.match(message) else None
+
+
+def _http_module():
+    try:
+        import httpx
+    except ImportError:
+        # Some openai builds ship on the httpx2 fork, which keeps the same API.
+        import httpx2 as httpx
+    return httpx
+
+
+def _is_retryable(error: Exception) -> bool:
+    import openai
+
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    response = getattr(error, 'response', None)
+    if response is not None:
+        headers = response.headers
+        try:
+            if 'retry-after-ms' in headers:
+                return min(BACKOFF_MAX, float(headers['retry-after-ms']) / 1000)
+            if 'retry-after' in headers:
+                return min(BACKOFF_MAX, float(headers['retry-after']))
+        except ValueError:
+            pass
+    # Full jitter keeps parallel workers from retrying in lockstep.
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
@@ -0,0 +1,142 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Mapping, Optional
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_INITIAL_CONCURRENCY = 4
+LOW_HEADROOM = 0.1
+DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+class RateLimitScheduler:
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY, min_concurrency: int = 1):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.in_flight = 0
+        self.reserved_tokens = 0
+        self.paused_until = 0.0
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self._stats = {'acquired': 0, 'waited': 0, 'increases': 0, 'decreases': 0}
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, estimated_tokens: int = 0) -> Iterator[None]:
+        self.acquire(estimated_tokens)
+        try:
+            yield
+        finally:
+            self.release(estimated_tokens)
+
+    def acquire(self, estimated_tokens: int = 0):
+        with self._cond:
+            waited = False
+            while True:
+                delay = self._admission_delay(estimated_tokens)
+                if delay == 0:
+                    break
+                waited = True
+                self._cond.wait(delay)
+
+            self.in_flight += 1
+            self.reserved_tokens += estimated_tokens
+            self._stats['acquired'] += 1
+            if waited:
+                self._stats['waited'] += 1
+
+    def release(self, estimated_tokens: int = 0):
+        with self._cond:
+            self.in_flight -= 1
+            self.reserved_tokens -= estimated_tokens
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            # Additive increase: about one extra slot per window of successful
+            # requests, unless the server says the budget is nearly spent.
+            if self.limit < self.max_concurrency and not self._near_limit():
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self._stats['increases'] += 1
+            self._cond.notify_all()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        with self._cond:
+            # Multiplicative decrease, and every worker holds off until the
+            # server's retry-after has passed.
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            self._stats['decreases'] += 1
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            self._cond.notify_all()
+
+    def observe(self, headers: Mapping[str, str]):
+        now = time.monotonic()
+        with self._cond:
+            if 'x-ratelimit-remaining-requests' in headers:
+                self.remaining_requests = _parse_int(headers['x-ratelimit-remaining-requests'])
+                self.requests_reset_at = now + parse_duration(headers.get('x-ratelimit-reset-requests', ''))
+            if 'x-ratelimit-remaining-tokens' in headers:
+                self.remaining_tokens = _parse_int(headers['x-ratelimit-remaining-tokens'])
+                self.tokens_reset_at = now + parse_duration(headers.get('x-ratelimit-reset-tokens', ''))
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'concurrency': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'remaining_requests': self.remaining_requests,
+                'remaining_tokens': self.remaining_tokens,
+            })
+            return stats
+
+    def _admission_delay(self, estimated_tokens: int) -> float:
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return 1.0
+
+        # The remaining budgets from the last response are shared with every
+        # request still in flight, so those are subtracted before admitting more.
+        if self.remaining_requests is not None and now < self.requests_reset_at and \
+                self.remaining_requests - self.in_flight <= 0:
+            return self.requests_reset_at - now
+        if self.remaining_tokens is not None and now < self.tokens_reset_at and \
+                self.remaining_tokens - self.reserved_tokens < estimated_tokens:
+            return self.tokens_reset_at - now
+        return 0
+
+    def _near_limit(self) -> bool:
+        if self.remaining_requests is not None and self.remaining_requests <= self.in_flight:
+            return True
+        if self.remaining_tokens is not None and self.reserved_tokens and \
+                self.remaining_tokens < self.reserved_tokens * (1 + LOW_HEADROOM):
+            return True
+        return False
+
+
+def parse_duration(value: str) -> float:
+    value = value.strip()
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in DURATION_PART.findall(value))
+
+
+def _parse_int(value: str) -> Optional[int]:
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,88 @@
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+WATCHED_GIT_FILES = ('index', 'HEAD', 'packed-refs')
+CHANGE_EVENTS = ('created', 'deleted', 'modified', 'moved')
+
+class RepoWatcher(FileSystemEventHandler):
+    def __init__(self, repo_path: str, callback: Callable[[], None], debounce: float = 0.3):
+        super().__init__()
+        self.repo_path = Path(repo_path).resolve()
+        self.git_dir = self.repo_path / '.git'
+        self.callback = callback
+        self.debounce = debounce
+        self.observer = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available() -> bool:
+        return Observer is not None
+
+    def start(self) -> bool:
+        if Observer is None:
+            return False
+        try:
+            self.observer = Observer()
+            self.observer.schedule(self, str(self.repo_path), recursive=True)
+            self.observer.daemon = True
+            self.observer.start()
+            return True
+        except Exception as e:
+            print(f"Error starting file watcher: {str(e)}")
+            self.observer = None
+            return False
+
+    def stop(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        if self.observer:
+            self.observer.stop()
+            self.observer = None
+
+    def on_any_event(self, event):
+        # Reads (opened/closed_no_write) come from git scanning the worktree itself.
+        if event.event_type not in CHANGE_EVENTS:
+            return
+        if event.is_directory and event.event_type == 'modified':
+            return
+
+        paths = [event.src_path, getattr(event, 'dest_path', None)]
+        if any(path and self._is_relevant(os.fsdecode(path)) for path in paths):
+            self._schedule()
+
+    def _is_relevant(self, path: str) -> bool:
+        try:
+            rel = Path(path).relative_to(self.git_dir)
+        except ValueError:
+            return True
+
+        # Inside .git only the index, HEAD and refs matter; object and lock
+        # file churn from our own commits would otherwise retrigger scans.
+        if rel.suffix == '.lock':
+            return False
+        return str(rel) in WATCHED_GIT_FILES or rel.parts[:1] == ('refs',)
+
+    def _schedule(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            self._timer = None
+        self.callback()
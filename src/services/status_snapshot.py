@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+SNAPSHOT_VERSION = 1
+
+
+class StatusSnapshot(NamedTuple):
+    files: List[Tuple[str, str, str]]
+    unpushed: int
+    fingerprint: Dict[str, object]
+
+
+class StatusSnapshotStore:
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = directory or Path.home() / ".gitcommitmanager" / "status"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def load(self, repo_path: str) -> Optional[StatusSnapshot]:
+        repo_path = str(Path(repo_path).resolve())
+        try:
+            with open(self._path(repo_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error reading status snapshot: {str(e)}")
+            return None
+
+        if data.get('version') != SNAPSHOT_VERSION or data.get('repo') != repo_path:
+            return None
+        # A snapshot taken at another HEAD or index may list changes that
+        # have since been committed, so it is only shown while both match.
+        if data.get('fingerprint') != repo_fingerprint(repo_path):
+            return None
+        return StatusSnapshot([tuple(entry) for entry in data['files']], data['unpushed'], data['fingerprint'])
+
+    def save(self, repo_path: str, files: List[Tuple[str, str, str]], unpushed: int,
+             scanned_at: Optional[Dict[str, object]] = None) -> bool:
+        # The fingerprint is read after the scan, because `git status` itself
+        # refreshes the index; a scan that raced with a commit is not kept.
+        repo_path = str(Path(repo_path).resolve())
+        fingerprint = repo_fingerprint(repo_path)
+        if fingerprint is None or (scanned_at and scanned_at.get('head') != fingerprint['head']):
+            return False
+
+        data = {
+            'version': SNAPSHOT_VERSION,
+            'repo': repo_path,
+            'fingerprint': fingerprint,
+            'unpushed': unpushed,
+            'files': [list(entry) for entry in files],
+        }
+        path = self._path(repo_path)
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(self.directory))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Error saving status snapshot: {str(e)}")
+            return False
+        return True
+
+    def _path(self, repo_path: str) -> Path:
+        return self.directory / f"{hashlib.sha1(repo_path.encode('utf-8')).hexdigest()}.json"
+
+
+def repo_fingerprint(repo_path: str) -> Optional[Dict[str, object]]:
+    # Read straight from .git so checking a snapshot never needs GitPython
+    # or a git subprocess.
+    git_dir = _git_dir(Path(repo_path))
+    if git_dir is None:
+        return None
+    try:
+        head = (git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+    if head.startswith('ref: '):
+        ref = head[5:]
+        head = f"{ref}@{_resolve_ref(git_dir, ref) or ''}"
+
+    try:
+        index = os.stat(git_dir / 'index')
+        index_mtime, index_size = index.st_mtime_ns, index.st_size
+    except OSError:
+        index_mtime, index_size = 0, 0
+    return {'head': head, 'index_mtime': index_mtime, 'index_size': index_size}
+
+
+def _git_dir(repo_path: Path) -> Optional[Path]:
+    dot_git = repo_path / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    # Worktrees and submodules point at their real git directory.
+    try:
+        content = dot_git.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+    if not content.startswith('gitdir:'):
+        return None
+    return (repo_path / content[len('gitdir:'):].strip()).resolve()
+
+
+def _resolve_ref(git_dir: Path, ref: str) -> Optional[str]:
+    common_dir = git_dir
+    try:
+        common_dir = (git_dir / (git_dir / 'commondir').read_text(encoding='utf-8').strip()).resolve()
+    except OSError:
+        pass
+
+    for base in (git_dir, common_dir):
+        try:
+            return (base / ref).read_text(encoding='utf-8').strip()
+        except OSError:
+            continue
+    try:
+        with open(common_dir / 'packed-refs', 'r', encoding='utf-8') as f:
+            for line in f:
+                sha, _, name = line.strip().partition(' ')
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
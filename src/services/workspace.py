@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from src.services.openai_service import OpenAIService
+
+MAX_SCAN_WORKERS = 8
+DEFAULT_PARALLEL_REPOS = 4
+MAX_DISCOVERY_DEPTH = 2
+SKIPPED_DIRS = {'node_modules', '__pycache__', '.venv', 'venv', '.tox'}
+
+
+class RepoStatus(NamedTuple):
+    path: str
+    branch: str
+    files: List[Tuple[str, str, str]]
+    unpushed: int = 0
+    error: Optional[str] = None
+
+    @property
+    def changed(self) -> int:
+        return len(self.files)
+
+
+def find_repositories(root: str, max_depth: int = MAX_DISCOVERY_DEPTH) -> List[str]:
+    root_path = Path(root).resolve()
+    if (root_path / '.git').exists():
+        return [str(root_path)]
+
+    repos = []
+    level = [root_path]
+    for _ in range(max_depth):
+        next_level = []
+        for directory in level:
+            try:
+                children = sorted(entry for entry in directory.iterdir() if entry.is_dir())
+            except OSError:
+                continue
+            for child in children:
+                if child.name.startswith('.') or child.name in SKIPPED_DIRS:
+                    continue
+                # Nested repositories (submodules, vendored checkouts) belong
+                # to the repository that contains them.
+                if (child / '.git').exists():
+                    repos.append(str(child))
+                else:
+                    next_level.append(child)
+        level = next_level
+    return repos
+
+
+def scan_repository(path: str) -> RepoStatus:
+    # Runs in a worker process, so it imports and opens everything itself.
+    from src.services.git_service import GitService
+
+    if not os.path.isdir(path):
+        return RepoStatus(path, '', [], error="directory not found")
+    try:
+        git_service = GitService(path)
+        if not git_service.is_git_repo():
+            return RepoStatus(path, '', [], error="not a git repository")
+        return RepoStatus(path, git_service.get_current_branch(), git_service.get_unstaged_files(),
+                          git_service.get_unpushed_count())
+    except Exception as e:
+        return RepoStatus(path, '', [], error=str(e))
+
+
+def scan_repositories(paths: List[str], max_workers: Optional[int] = None,
+                      on_result: Optional[Callable[[RepoStatus], None]] = None,
+                      cancelled: Optional[threading.Event] = None) -> List[RepoStatus]:
+    if not paths:
+        return []
+    max_workers = max_workers or min(MAX_SCAN_WORKERS, os.cpu_count() or 1, len(paths))
+
+    # Status scans are mostly git subprocesses plus GitPython parsing, which
+    # holds the GIL; separate processes keep them from serializing. Workers
+    # are spawned rather than forked because the caller may be a Qt thread.
+    try:
+        executor = ProcessPoolExecutor(max_workers=max_workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+    except (OSError, NotImplementedError, ValueError) as e:
+        print(f"Error starting scan processes, using threads: {str(e)}")
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    results = []
+    with executor:
+        futures = {executor.submit(scan_repository, path): path for path in paths}
+        for future in as_completed(futures):
+            if cancelled and cancelled.is_set():
+                for pending in futures:
+                    pending.cancel()
+                break
+            try:
+                status = future.result()
+            except Exception as e:
+                status = RepoStatus(futures[future], '', [], error=str(e))
+            results.append(status)
+            if on_result:
+                on_result(status)
+    return results
+
+
+class WorkspaceCommit:
+    def __init__(self, openai_service: OpenAIService, repos: Dict[str, List[Tuple[str, str]]],
+                 language: str, max_repos: int = DEFAULT_PARALLEL_REPOS,
+                 on_committed: Optional[Callable[[str, List[str], str], None]] = None,
+                 on_error: Optional[Callable[[str, str], None]] = None,
+                 on_repo_finished: Optional[Callable[[str, int], None]] = None,
+                 **pipeline_options):
+        # Every pipeline shares one OpenAIService, so all repositories draw
+        # from the same rate-limit scheduler and concurrency budget.
+        self.openai_service = openai_service
+        self.repos = repos
+        self.language = language
+        self.max_repos = max(1, max_repos)
+        self.on_committed = on_committed
+        self.on_error = on_error
+        self.on_repo_finished = on_repo_finished
+        self.pipeline_options = pipeline_options
+        self.pipelines = {}
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            for pipeline in self.pipelines.values():
+                pipeline.cancel()
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.max_repos) as executor:
+            futures = {executor.submit(self._run_repo, repo, files): repo
+                       for repo, files in self.repos.items() if files}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    self._notify(self.on_error, futures[future], f"Error committing: {str(e)}")
+
+    def committed(self) -> Dict[str, List[Tuple[List[str], str, str]]]:
+        with self._lock:
+            return {repo: list(pipeline.committed) for repo, pipeline in self.pipelines.items()}
+
+    def _run_repo(self, repo: str, files: List[Tuple[str, str]]):
+        from src.services.commit_pipeline import CommitPipeline
+        from src.services.git_service import GitService
+
+        if self._cancelled.is_set():
+            return
+        pipeline = CommitPipeline(
+            GitService(repo),
+            self.openai_service,
+            files,
+            self.language,
+            on_committed=lambda paths, message: self._notify(self.on_committed, repo, paths, message),
+            on_error=lambda message: self._notify(self.on_error, repo, message),
+            **self.pipeline_options
+        )
+        with self._lock:
+            self.pipelines[repo] = pipeline
+            if self._cancelled.is_set():
+                pipeline.cancel()
+        pipeline.run()
+        self._notify(self.on_repo_finished, repo, len(pipeline.committed))
+
+    def _notify(self, callback: Optional[Callable], *args):
+        if callback:
+            callback(*args)
@@ -2,8 +2,6 @@ from PyQt6.QtWidgets import QMainWindow, QStackedWidget
 from PyQt6.QtCore import Qt
 from src.config.settings import Settings
 from src.ui.pages.project_select_page import ProjectSelectPage
-from src.ui.pages.commit_page import CommitPage
-from src.ui.pages.settings_page import SettingsPage
 
 class MainWindow(QMainWindow):
    def __init__(self, settings: Settings):
@@ -19,17 +17,16 @@ class MainWindow(QMainWindow):
        self.stack = QStackedWidget()
        self.setCentralWidget(self.stack)
 
+       # Only the first page is built up front; the others (and the git and
+       # LLM modules behind them) are loaded the first time they are shown.
        self.project_page = ProjectSelectPage(self.settings)
-       self.commit_page = CommitPage(self.settings)
-       self.settings_page = SettingsPage(self.settings)
+       self.commit_page = None
+       self.settings_page = None
+       self.workspace_page = None
 
        self.stack.addWidget(self.project_page)
-       self.stack.addWidget(self.commit_page)
-       self.stack.addWidget(self.settings_page)
-
        self.project_page.project_selected.connect(self.on_project_selected)
-       self.commit_page.show_settings.connect(self.show_settings)
-       self.settings_page.back_clicked.connect(self.show_commit_page)
+       self.project_page.workspace_requested.connect(self.show_workspace)
 
        self.apply_styles()
 
@@ -119,12 +116,55 @@ class MainWindow(QMainWindow):
            }
        """)
 
+   def ensure_commit_page(self):
+       if self.commit_page is None:
+           from src.ui.pages.commit_page import CommitPage
+
+           self.commit_page = CommitPage(self.settings)
+           self.commit_page.show_settings.connect(self.show_settings)
+           self.stack.addWidget(self.commit_page)
+       return self.commit_page
+
+   def ensure_settings_page(self):
+       if self.settings_page is None:
+           from src.ui.pages.settings_page import SettingsPage
+
+           self.settings_page = SettingsPage(self.settings)
+           self.settings_page.back_clicked.connect(self.show_commit_page)
+           self.stack.addWidget(self.settings_page)
+       return self.settings_page
+
+   def ensure_workspace_page(self):
+       if self.workspace_page is None:
+           from src.ui.pages.workspace_page import WorkspacePage
+
+           self.workspace_page = WorkspacePage(self.settings)
+           self.workspace_page.back_clicked.connect(self.show_project_page)
+           self.workspace_page.project_selected.connect(self.on_project_selected)
+           self.stack.addWidget(self.workspace_page)
+       return self.workspace_page
+
+   def closeEvent(self, event):
+       self.project_page.shutdown()
+       if self.workspace_page:
+           self.workspace_page.shutdown()
+       if self.commit_page:
+           self.commit_page.shutdown()
+       super().closeEvent(event)
+
    def on_project_selected(self, path: str):
-       self.commit_page.set_project(path)
-       self.stack.setCurrentWidget(self.commit_page)
+       commit_page = self.ensure_commit_page()
+       commit_page.set_project(path)
+       self.stack.setCurrentWidget(commit_page)
+
+   def show_workspace(self):
+       self.stack.setCurrentWidget(self.ensure_workspace_page())
+
+   def show_project_page(self):
+       self.stack.setCurrentWidget(self.project_page)
 
    def show_settings(self):
-       self.stack.setCurrentWidget(self.settings_page)
+       self.stack.setCurrentWidget(self.ensure_settings_page())
 
    def show_commit_page(self):
-       self.stack.setCurrentWidget(self.commit_page)
\ No newline at end of file
+       self.stack.setCurrentWidget(self.ensure_commit_page())
\ No newline at end of file
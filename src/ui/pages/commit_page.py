@@ -1,74 +1,169 @@
 import os
+import threading
 from pathlib import Path
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                          QLabel, QProgressDialog, QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QThread
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from src.config.settings import Settings
-from src.services.git_service import GitService
-from src.services.openai_service import OpenAIService
+from src.services.git_service import GitService, PushCancelled
+from src.services.openai_service import OpenAIService, DEFAULT_MAX_DIFF_CHARS
+from src.services.commit_pipeline import CommitPipeline, DEFAULT_BATCH_SIZE
+from src.services.message_cache import MessageCache
+from src.services.rate_limiter import RateLimitScheduler, DEFAULT_MAX_CONCURRENCY
+from src.services.status_snapshot import StatusSnapshotStore, repo_fingerprint
 from src.ui.widgets.file_list_widget import FileListWidget
 
+def describe_files(file_paths: List[str]) -> str:
+   name = Path(file_paths[0]).name if file_paths else ''
+   if len(file_paths) > 1:
+       return f"{name} 외 {len(file_paths) - 1}개"
+   return name
+
+SHUTDOWN_WAIT_MS = 3000
+
+PUSH_STAGES = {
+   'counting': '객체 세는 중',
+   'compressing': '객체 압축 중',
+   'writing': '객체 전송 중',
+   'resolving': '델타 처리 중',
+   'finding': '소스 찾는 중'
+}
+
+RULE_LABELS = {
+   'lockfile': '잠금 파일',
+   'version_bump': '버전 변경',
+   'whitespace': '공백 정리',
+   'imports': 'import 정렬',
+   'generated': '생성된 파일',
+   'binary': '바이너리'
+}
+
 class CommitWorker(QThread):
-   progress = pyqtSignal(str, str)
+   grouped = pyqtSignal(list)
+   generated = pyqtSignal(list, str)
+   streamed = pyqtSignal(list, str)
+   progress = pyqtSignal(list, str)
    error = pyqtSignal(str)
+   rule_stats = pyqtSignal(dict)
    finished = pyqtSignal()
 
    def __init__(self, git_service: GitService, openai_service: OpenAIService,
-               files: List[Tuple[str, str]], language: str):
+               files: List[Tuple[str, str]], language: str, max_workers: Optional[int] = None,
+               context_lines: int = 3, max_diff_chars: int = None, use_cache: bool = True,
+               group_files: bool = False, use_rules: bool = True, stream: bool = False,
+               batch_size: int = 1):
        super().__init__()
-       self.git_service = git_service
-       self.openai_service = openai_service
-       self.files = files
-       self.language = language
+       self.pipeline = CommitPipeline(
+           git_service,
+           openai_service,
+           files,
+           language,
+           max_workers=max_workers,
+           context_lines=context_lines,
+           max_diff_chars=max_diff_chars,
+           use_cache=use_cache,
+           group_files=group_files,
+           use_rules=use_rules,
+           stream=stream,
+           batch_size=batch_size,
+           on_grouped=self.grouped.emit,
+           on_generated=self.generated.emit,
+           on_token=self.streamed.emit,
+           on_committed=self.progress.emit,
+           on_error=self.error.emit
+       )
+
+   def cancel(self):
+       self.pipeline.cancel()
 
    def run(self):
-       for file_path, change_type in self.files:
-           try:
-               if change_type == 'D':
-                   commit_message = "remove: " + Path(file_path).name
-               elif change_type == 'R':
-                   commit_message = "rename: " + Path(file_path).name
-               else:
-                   try:
-                       abs_path = self.git_service.get_absolute_path(file_path)
-                       content = ""
-                       for encoding in ['utf-8', 'cp949', 'euc-kr']:
-                           try:
-                               with open(abs_path, 'r', encoding=encoding) as f:
-                                   content = f.read()
-                               break
-                           except UnicodeDecodeError:
-                               continue
-                       
-                       if not content:
-                           content = f"Update {Path(file_path).name}"
-                           
-                   except FileNotFoundError:
-                       if change_type == 'D':
-                           content = f"Remove {Path(file_path).name}"
-                       else:
-                           raise
-
-                   commit_message = self.openai_service.generate_commit_message(
-                       content, self.language
-                   )
-                   if not commit_message:
-                       commit_message = f"chore: update {Path(file_path).name}"
-
-               if not self.git_service.stage_file(file_path, change_type):
-                   raise Exception(f"Failed to stage file {file_path}")
-
-               if not self.git_service.commit(commit_message):
-                   raise Exception(f"Failed to commit file {file_path}")
-
-               self.progress.emit(file_path, commit_message)
+       self.pipeline.run()
+       self.rule_stats.emit(self.pipeline.rule_stats())
+       self.finished.emit()
+
+class PushWorker(QThread):
+   progress = pyqtSignal(str, int, int, str)
+   pushed = pyqtSignal(list)
+   error = pyqtSignal(str)
+   cancelled = pyqtSignal()
+
+   def __init__(self, repo_path: str):
+       super().__init__()
+       self.repo_path = repo_path
+       self._cancel_event = threading.Event()
+
+   def cancel(self):
+       self._cancel_event.set()
+
+   def run(self):
+       try:
+           results = GitService(self.repo_path).push(self.progress.emit, self._cancel_event)
+           self.pushed.emit(results)
+       except PushCancelled:
+           self.cancelled.emit()
+       except Exception as e:
+           self.error.emit(str(e))
+
+class StatusWorker(QThread):
+   snapshot_ready = pyqtSignal(int, list, int)
+   files_ready = pyqtSignal(int, list)
+   unpushed_ready = pyqtSignal(int, int)
 
+   def __init__(self, repo_path: str, generation: int, use_snapshot: bool = True):
+       super().__init__()
+       self.repo_path = repo_path
+       self.generation = generation
+       self.use_snapshot = use_snapshot
+       self._requested = threading.Event()
+       self._stopped = False
+
+   def request_refresh(self):
+       # Requests made while a scan is running collapse into a single rescan.
+       self._requested.set()
+
+   def stop(self):
+       # Does not wait: a scan in progress finishes on its own thread and
+       # its results are dropped by generation.
+       self._stopped = True
+       self._requested.set()
+
+   def run(self):
+       store = None
+       saved = None
+       if self.use_snapshot:
+           # The last known status is shown right away and then replaced by
+           # the first real scan below.
+           try:
+               store = StatusSnapshotStore()
+               snapshot = store.load(self.repo_path)
            except Exception as e:
-               self.error.emit(f"Error processing {file_path}: {str(e)}")
-               continue
+               print(f"Error loading status snapshot: {str(e)}")
+               snapshot = None
+           if snapshot:
+               saved = (snapshot.files, snapshot.unpushed)
+               self.snapshot_ready.emit(self.generation, snapshot.files, snapshot.unpushed)
 
-       self.finished.emit()
+       git_service = GitService(self.repo_path)
+       while True:
+           self._requested.wait()
+           self._requested.clear()
+           if self._stopped:
+               break
+
+           scanned_at = repo_fingerprint(self.repo_path)
+           files = git_service.get_unstaged_files()
+           if self._stopped:
+               break
+           self.files_ready.emit(self.generation, files)
+           unpushed = git_service.get_unpushed_count()
+           if self._stopped:
+               break
+           self.unpushed_ready.emit(self.generation, unpushed)
+
+           if store and saved != (files, unpushed):
+               if store.save(self.repo_path, files, unpushed, scanned_at):
+                   saved = (files, unpushed)
 
 class CommitPage(QWidget):
    show_settings = pyqtSignal()
@@ -78,6 +173,10 @@ class CommitPage(QWidget):
        self.settings = settings
        self.git_service = None
        self.openai_service = None
+       self.status_worker = None
+       self.status_generation = 0
+       self.retired_workers = set()
+       self.unpushed_count = 0
        self.init_ui()
 
    def init_ui(self):
@@ -184,21 +283,93 @@ class CommitPage(QWidget):
            self.show_settings.emit()
            return
 
-       self.openai_service = OpenAIService(api_key)
+       # The LLM client is created on the first commit, not when a project is opened.
+       if self.openai_service:
+           self.openai_service.close()
+           self.openai_service = None
+       self.file_list.watch(path)
+       self.start_status_worker(path)
        self.update_file_list()
-       self.update_push_button()
+
+   def ensure_openai_service(self) -> OpenAIService:
+       if self.openai_service is None:
+           self.openai_service = OpenAIService(
+               self.settings.get('openai_api_key'),
+               cache=MessageCache(),
+               base_url=self.settings.get('openai_base_url'),
+               scheduler=RateLimitScheduler(self.settings.get('max_concurrency', DEFAULT_MAX_CONCURRENCY))
+           )
+       return self.openai_service
+
+   def start_status_worker(self, path: str):
+       self.stop_status_worker()
+       self.status_generation += 1
+       self.status_worker = StatusWorker(path, self.status_generation,
+                                         self.settings.get('status_snapshot_enabled', True))
+       self.status_worker.snapshot_ready.connect(self.on_worker_snapshot)
+       self.status_worker.files_ready.connect(self.on_worker_files)
+       self.status_worker.unpushed_ready.connect(self.on_worker_unpushed)
+       self.status_worker.start()
+
+   def stop_status_worker(self):
+       worker = self.status_worker
+       if not worker:
+           return
+       self.status_worker = None
+       self.status_generation += 1
+       worker.stop()
+       worker.snapshot_ready.disconnect()
+       worker.files_ready.disconnect()
+       worker.unpushed_ready.disconnect()
+       # Keep a reference until the thread has actually exited.
+       self.retired_workers.add(worker)
+       worker.finished.connect(lambda: self.retired_workers.discard(worker))
+       worker.finished.connect(worker.deleteLater)
+
+   def shutdown(self):
+       self.file_list.stop_watching()
+       self.stop_status_worker()
+       # The app is exiting, so give running scans a bounded chance to end
+       # before their threads are torn down.
+       for worker in list(self.retired_workers):
+           worker.wait(SHUTDOWN_WAIT_MS)
+       if self.openai_service:
+           self.openai_service.close()
 
    def update_file_list(self):
-       if self.git_service:
-           files = self.git_service.get_unstaged_files()
-           self.file_list.set_files(files)
-           self.commit_btn.setEnabled(bool(files))
+       if self.status_worker:
+           self.status_worker.request_refresh()
 
    def update_push_button(self):
-       if self.git_service:
-           unpushed = len(self.git_service.get_unpushed_commits())
-           self.push_btn.setText(f"Push ({unpushed})")
-           self.push_btn.setEnabled(unpushed > 0)
+       if self.status_worker:
+           self.status_worker.request_refresh()
+
+   def on_worker_snapshot(self, generation: int, files: list, unpushed: int):
+       if generation == self.status_generation:
+           self.on_snapshot_ready(files, unpushed)
+
+   def on_worker_files(self, generation: int, files: list):
+       if generation == self.status_generation:
+           self.on_files_ready(files)
+
+   def on_worker_unpushed(self, generation: int, unpushed: int):
+       if generation == self.status_generation:
+           self.on_unpushed_ready(unpushed)
+
+   def on_snapshot_ready(self, files: list, unpushed: int):
+       # Committing waits for the live scan, since the snapshot may be stale.
+       self.file_list.set_files(files)
+       self.commit_btn.setEnabled(False)
+       self.on_unpushed_ready(unpushed)
+
+   def on_files_ready(self, files: list):
+       self.file_list.set_files(files)
+       self.commit_btn.setEnabled(bool(files))
+
+   def on_unpushed_ready(self, unpushed: int):
+       self.unpushed_count = unpushed
+       self.push_btn.setText(f"Push ({unpushed})")
+       self.push_btn.setEnabled(unpushed > 0)
 
    def commit_selected(self):
        files = self.file_list.get_selected_files()
@@ -206,6 +377,12 @@ class CommitPage(QWidget):
            QMessageBox.warning(self, '경고', '커밋할 파일을 선택해주세요.')
            return
 
+       try:
+           openai_service = self.ensure_openai_service()
+       except Exception as e:
+           QMessageBox.critical(self, '에러', f'OpenAI 클라이언트를 만들 수 없습니다: {str(e)}')
+           return
+
        progress = QProgressDialog("커밋 진행 중...", "취소", 0, len(files), self)
        progress.setWindowModality(Qt.WindowModality.WindowModal)
        progress.setAutoClose(False)
@@ -227,41 +404,137 @@ class CommitPage(QWidget):
 
        self.commit_worker = CommitWorker(
            self.git_service,
-           self.openai_service,
+           openai_service,
            files,
-           self.settings.get('language')
+           self.settings.get('language'),
+           context_lines=self.settings.get('diff_context_lines', 3),
+           max_diff_chars=self.settings.get('diff_max_chars', DEFAULT_MAX_DIFF_CHARS),
+           use_cache=self.settings.get('message_cache_enabled', True),
+           group_files=self.settings.get('group_commits', False),
+           use_rules=self.settings.get('local_rules_enabled', True),
+           stream=self.settings.get('stream_messages', True),
+           batch_size=DEFAULT_BATCH_SIZE if self.settings.get('batch_requests', False) else 1
        )
 
-       def on_progress(file_path, commit_message):
+       group_count = len(files)
+       generated_count = 0
+       committed_files = 0
+       failed_groups = 0
+       rule_hits = {}
+
+       def on_grouped(groups):
+           nonlocal group_count
+           group_count = len(groups)
+           progress.setMaximum(group_count)
+           if group_count != len(files):
+               summary = "\n".join(f"• {describe_files(group)}" for group in groups[:10])
+               if group_count > 10:
+                   summary += f"\n… 외 {group_count - 10}개 그룹"
+               progress.setLabelText(f"{len(files)}개 파일 → {group_count}개 커밋\n{summary}")
+
+       def on_generated(file_paths, commit_message):
+           nonlocal generated_count
+           generated_count += 1
+           progress.setLabelText(
+               f"메시지 생성 중 ({generated_count}/{group_count}): {describe_files(file_paths)}\n{commit_message}"
+           )
+
+       def on_streamed(file_paths, text):
+           progress.setLabelText(
+               f"메시지 생성 중 ({generated_count}/{group_count}): {describe_files(file_paths)}\n{text}▌"
+           )
+
+       def on_progress(file_paths, commit_message):
+           nonlocal committed_files
+           committed_files += len(file_paths)
            current = progress.value() + 1
-           progress.setLabelText(f"커밋 중: {Path(file_path).name}\n{commit_message}")
+           progress.setLabelText(f"커밋 중: {describe_files(file_paths)}\n{commit_message}")
            progress.setValue(current)
+           self.on_unpushed_ready(self.unpushed_count + 1)
 
        def on_error(message):
+           nonlocal failed_groups
+           failed_groups += 1
            QMessageBox.critical(self, '에러', message)
-           progress.close()
+
+       def on_rule_stats(stats):
+           rule_hits.update(stats)
 
        def on_finished():
            progress.close()
            self.update_file_list()
            self.update_push_button()
-           QMessageBox.information(self, '완료', '모든 파일이 커밋되었습니다.')
+           if committed_files == len(files):
+               message = f'모든 파일({committed_files}개)이 커밋되었습니다.'
+           else:
+               message = f'{len(files)}개 파일 중 {committed_files}개가 커밋되었습니다.'
+               if failed_groups:
+                   message += f'\n실패: {failed_groups}건'
+               skipped = len(files) - committed_files
+               if progress.wasCanceled() and skipped:
+                   message += f'\n취소되어 커밋되지 않은 파일: {skipped}개'
+           local = {rule: count for rule, count in rule_hits.items() if rule != 'llm'}
+           if local:
+               details = ", ".join(f"{RULE_LABELS.get(rule, rule)} {count}" for rule, count in local.items())
+               message += f"\n\n로컬 규칙으로 생성: {details}\nLLM 요청: {rule_hits.get('llm', 0)}개 파일"
+           if committed_files == len(files):
+               QMessageBox.information(self, '완료', message)
+           else:
+               QMessageBox.warning(self, '일부 실패', message)
 
+       self.commit_worker.grouped.connect(on_grouped)
+       self.commit_worker.generated.connect(on_generated)
+       self.commit_worker.streamed.connect(on_streamed)
        self.commit_worker.progress.connect(on_progress)
        self.commit_worker.error.connect(on_error)
+       self.commit_worker.rule_stats.connect(on_rule_stats)
        self.commit_worker.finished.connect(on_finished)
+       progress.canceled.connect(self.commit_worker.cancel)
        self.commit_worker.start()
 
    def push_changes(self):
-       try:
-           if not self.git_service.has_remote():
-               QMessageBox.warning(self, '경고', 'Remote 저장소가 설정되어 있지 않습니다.')
-               return
+       if not self.git_service.has_remote():
+           QMessageBox.warning(self, '경고', 'Remote 저장소가 설정되어 있지 않습니다.')
+           return
+
+       progress = QProgressDialog("푸시 준비 중...", "취소", 0, 0, self)
+       progress.setWindowModality(Qt.WindowModality.WindowModal)
+       progress.setAutoClose(False)
+       progress.setMinimumDuration(0)
+       progress.show()
 
-           if self.git_service.push():
-               QMessageBox.information(self, '성공', '변경사항이 성공적으로 푸시되었습니다.')
-               self.update_push_button()
+       self.push_worker = PushWorker(str(self.git_service.repo_path))
+
+       def on_progress(stage, current, maximum, message):
+           stage_text = PUSH_STAGES.get(stage, stage)
+           counts = f" {current}/{maximum}" if maximum else f" {current}"
+           progress.setLabelText(f"{stage_text}{counts}\n{message}".rstrip())
+           progress.setMaximum(maximum)
+           progress.setValue(min(current, maximum) if maximum else 0)
+
+       def on_pushed(results):
+           progress.close()
+           self.update_push_button()
+           lines = "\n".join(f"{'✓' if r.ok else '✗'} {r.local_ref} → {r.remote_ref}: {r.summary}"
+                             for r in results)
+           if all(r.ok for r in results):
+               QMessageBox.information(self, '성공', f'변경사항이 성공적으로 푸시되었습니다.\n\n{lines}')
            else:
-               QMessageBox.critical(self, '에러', '푸시 중 오류가 발생했습니다.')
-       except Exception as e:
-           QMessageBox.critical(self, '에러', f'푸시 중 오류가 발생했습니다: {str(e)}')
\ No newline at end of file
+               QMessageBox.warning(self, '일부 실패', f'일부 ref가 푸시되지 않았습니다.\n\n{lines}')
+
+       def on_error(message):
+           progress.close()
+           self.update_push_button()
+           QMessageBox.critical(self, '에러', f'푸시 중 오류가 발생했습니다: {message}')
+
+       def on_cancelled():
+           progress.close()
+           self.update_push_button()
+
+       self.push_worker.progress.connect(on_progress)
+       self.push_worker.pushed.connect(on_pushed)
+       self.push_worker.error.connect(on_error)
+       self.push_worker.cancelled.connect(on_cancelled)
+       progress.canceled.connect(self.push_worker.cancel)
+       self.push_btn.setEnabled(False)
+       self.push_worker.start()
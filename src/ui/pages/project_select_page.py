@@ -1,15 +1,93 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
-                        QFileDialog, QListWidget, QHBoxLayout)
-from PyQt6.QtCore import pyqtSignal, Qt
+                        QFileDialog, QListWidget, QListWidgetItem, QHBoxLayout)
+from PyQt6.QtCore import pyqtSignal, Qt, QThread, QTimer
 from src.config.settings import Settings
+from src.services.status_snapshot import StatusSnapshotStore, repo_fingerprint
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import threading
+
+WARMUP_PROJECTS = 3
+WARMUP_DELAY_MS = 1000
+PRIME_CHUNK_BYTES = 1 << 20
+
+def describe_summary(path: str, changed: int, unpushed: int) -> str:
+   parts = [f"변경 {changed}개" if changed else "변경 없음"]
+   if unpushed:
+       parts.append(f"push 대기 {unpushed}")
+   return f"{path}    ·  {' · '.join(parts)}"
+
+def prime_file(path: Path, cancelled: Optional[threading.Event] = None):
+   # Reading the file once pulls it into the OS page cache, so the first
+   # real scan does not wait on a cold disk.
+   try:
+       with open(path, 'rb') as f:
+           while f.read(PRIME_CHUNK_BYTES):
+               if cancelled and cancelled.is_set():
+                   return
+   except OSError:
+       pass
+
+class WarmupWorker(QThread):
+   summary_ready = pyqtSignal(str, int, int)
+
+   def __init__(self, paths: List[str]):
+       super().__init__()
+       self.paths = paths
+       self._cancelled = threading.Event()
+
+   def cancel(self):
+       # Also terminates a git status that is still running, so a huge
+       # repository does not hold up the project the user just opened.
+       self._cancelled.set()
+
+   def run(self):
+       from src.services.git_service import GitService
+
+       try:
+           store = StatusSnapshotStore()
+       except Exception as e:
+           print(f"Error opening status snapshots: {str(e)}")
+           return
+
+       # Cached snapshots give every badge right away; the scans below then
+       # refresh them (and the snapshots) one project at a time.
+       for path in self.paths:
+           snapshot = store.load(path)
+           if snapshot:
+               self.summary_ready.emit(path, len(snapshot.files), snapshot.unpushed)
+
+       for path in self.paths:
+           if self._cancelled.is_set():
+               return
+           try:
+               git_service = GitService(path)
+               if not git_service.is_git_repo():
+                   continue
+               prime_file(Path(git_service.repo.git_dir) / 'index', self._cancelled)
+               scanned_at = repo_fingerprint(path)
+               files = git_service.get_unstaged_files(self._cancelled)
+               if self._cancelled.is_set():
+                   return
+               unpushed = git_service.get_unpushed_count()
+           except Exception as e:
+               print(f"Error warming up {path}: {str(e)}")
+               continue
+           if self._cancelled.is_set():
+               return
+           store.save(path, files, unpushed, scanned_at)
+           self.summary_ready.emit(path, len(files), unpushed)
 
 class ProjectSelectPage(QWidget):
    project_selected = pyqtSignal(str)
+   workspace_requested = pyqtSignal()
 
    def __init__(self, settings: Settings):
        super().__init__()
        self.settings = settings
+       self.warmup_worker = None
+       self.warmup_scheduled = False
+       self.summaries: Dict[str, Tuple[int, int]] = {}
        self.init_ui()
 
    def init_ui(self):
@@ -46,6 +124,24 @@ class ProjectSelectPage(QWidget):
        select_btn.setCursor(Qt.CursorShape.PointingHandCursor)
        layout.addWidget(select_btn, alignment=Qt.AlignmentFlag.AlignCenter)
 
+       workspace_btn = QPushButton("워크스페이스 (여러 저장소)")
+       workspace_btn.setStyleSheet("""
+           QPushButton {
+               background-color: white;
+               color: #2196F3;
+               border: 2px solid #2196F3;
+               padding: 10px;
+               border-radius: 8px;
+               min-width: 200px;
+           }
+           QPushButton:hover {
+               background-color: #e3f2fd;
+           }
+       """)
+       workspace_btn.clicked.connect(self.open_workspace)
+       workspace_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+       layout.addWidget(workspace_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+
        recent_header = QHBoxLayout()
        recent_label = QLabel("최근 프로젝트")
        recent_label.setStyleSheet("font-size: 18px; font-weight: bold; margin-top: 20px;")
@@ -93,13 +189,50 @@ class ProjectSelectPage(QWidget):
        self.update_recent_list()
        layout.addStretch()
 
+   def showEvent(self, event):
+       super().showEvent(event)
+       # Warm-up waits until the window is up and idle, so it never delays the first paint.
+       if not self.warmup_scheduled and self.settings.get('warmup_recent_projects', True):
+           self.warmup_scheduled = True
+           QTimer.singleShot(WARMUP_DELAY_MS, self.start_warmup)
+
+   def start_warmup(self):
+       if self.warmup_worker or not self.isVisible():
+           return
+       paths = [self.recent_list.item(row).data(Qt.ItemDataRole.UserRole)
+                for row in range(min(WARMUP_PROJECTS, self.recent_list.count()))]
+       if not paths:
+           return
+       self.warmup_worker = WarmupWorker(paths)
+       self.warmup_worker.summary_ready.connect(self.on_summary_ready)
+       self.warmup_worker.start(QThread.Priority.LowPriority)
+
+   def stop_warmup(self):
+       if self.warmup_worker:
+           self.warmup_worker.cancel()
+
+   def shutdown(self):
+       if self.warmup_worker:
+           self.warmup_worker.cancel()
+           self.warmup_worker.wait()
+
+   def on_summary_ready(self, path: str, changed: int, unpushed: int):
+       self.summaries[path] = (changed, unpushed)
+       for row in range(self.recent_list.count()):
+           item = self.recent_list.item(row)
+           if item.data(Qt.ItemDataRole.UserRole) == path:
+               item.setText(describe_summary(path, changed, unpushed))
+
    def update_recent_list(self):
        self.recent_list.clear()
        recent_projects = self.settings.get('recent_projects', [])
        for project in recent_projects:
            path = Path(project)
            if path.exists() and path.is_dir():
-               self.recent_list.addItem(str(path))
+               summary = self.summaries.get(str(path))
+               item = QListWidgetItem(describe_summary(str(path), *summary) if summary else str(path))
+               item.setData(Qt.ItemDataRole.UserRole, str(path))
+               self.recent_list.addItem(item)
 
    def select_project(self):
        dir_path = QFileDialog.getExistingDirectory(
@@ -109,17 +242,24 @@ class ProjectSelectPage(QWidget):
            QFileDialog.Option.ShowDirsOnly
        )
        if dir_path:
+           self.stop_warmup()
            self.settings.add_recent_project(dir_path)
            self.project_selected.emit(dir_path)
 
    def on_recent_selected(self, item):
-       path = Path(item.text())
+       project = item.data(Qt.ItemDataRole.UserRole)
+       path = Path(project)
        if path.exists() and path.is_dir():
+           self.stop_warmup()
            self.project_selected.emit(str(path))
        else:
-           self.settings.remove_recent_project(item.text())
+           self.settings.remove_recent_project(project)
            self.update_recent_list()
 
+   def open_workspace(self):
+       self.stop_warmup()
+       self.workspace_requested.emit()
+
    def clear_recent_list(self):
        self.settings.clear_recent_projects()
        self.update_recent_list()
\ No newline at end of file
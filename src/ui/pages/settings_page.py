@@ -1,6 +1,8 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QComboBox, QMessageBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QComboBox, QMessageBox, QSpinBox, QCheckBox
 from PyQt6.QtCore import pyqtSignal
 from src.config.settings import Settings
+from src.services.openai_service import DEFAULT_MAX_DIFF_CHARS
+from src.services.message_cache import MessageCache
 
 class SettingsPage(QWidget):
     back_clicked = pyqtSignal()
@@ -30,6 +32,11 @@ class SettingsPage(QWidget):
         self.api_key_input.setText(self.settings.get('openai_api_key', ''))
         self.api_key_input.setPlaceholderText("sk-...")
         api_layout.addWidget(self.api_key_input)
+        api_layout.addWidget(QLabel("API Base URL (선택):"))
+        self.base_url_input = QLineEdit()
+        self.base_url_input.setText(self.settings.get('openai_base_url', ''))
+        self.base_url_input.setPlaceholderText("https://api.openai.com/v1")
+        api_layout.addWidget(self.base_url_input)
         layout.addLayout(api_layout)
 
         lang_layout = QVBoxLayout()
@@ -40,20 +47,117 @@ class SettingsPage(QWidget):
         lang_layout.addWidget(self.language_combo)
         layout.addLayout(lang_layout)
 
+        diff_layout = QHBoxLayout()
+        context_layout = QVBoxLayout()
+        context_layout.addWidget(QLabel("Diff 컨텍스트 줄 수:"))
+        self.context_lines_spin = QSpinBox()
+        self.context_lines_spin.setRange(0, 50)
+        self.context_lines_spin.setValue(self.settings.get('diff_context_lines', 3))
+        context_layout.addWidget(self.context_lines_spin)
+        diff_layout.addLayout(context_layout)
+
+        max_chars_layout = QVBoxLayout()
+        max_chars_layout.addWidget(QLabel("Diff 최대 길이 (문자):"))
+        self.max_chars_spin = QSpinBox()
+        self.max_chars_spin.setRange(1000, 200000)
+        self.max_chars_spin.setSingleStep(1000)
+        self.max_chars_spin.setValue(self.settings.get('diff_max_chars', DEFAULT_MAX_DIFF_CHARS))
+        max_chars_layout.addWidget(self.max_chars_spin)
+        diff_layout.addLayout(max_chars_layout)
+        layout.addLayout(diff_layout)
+
+        cache_layout = QHBoxLayout()
+        self.cache_cb = QCheckBox("커밋 메시지 캐시 사용")
+        self.cache_cb.setChecked(self.settings.get('message_cache_enabled', True))
+        cache_layout.addWidget(self.cache_cb)
+        self.cache_stats_label = QLabel()
+        self.cache_stats_label.setStyleSheet("color: #666; font-size: 12px;")
+        cache_layout.addWidget(self.cache_stats_label)
+        cache_layout.addStretch()
+        clear_cache_btn = QPushButton("캐시 비우기")
+        clear_cache_btn.clicked.connect(self.clear_cache)
+        cache_layout.addWidget(clear_cache_btn)
+        layout.addLayout(cache_layout)
+
+        self.group_commits_cb = QCheckBox("관련 파일을 묶어서 하나의 커밋으로 만들기")
+        self.group_commits_cb.setChecked(self.settings.get('group_commits', False))
+        layout.addWidget(self.group_commits_cb)
+
+        self.local_rules_cb = QCheckBox("단순 변경(잠금 파일, 공백, import 정렬 등)은 LLM 없이 메시지 생성")
+        self.local_rules_cb.setChecked(self.settings.get('local_rules_enabled', True))
+        layout.addWidget(self.local_rules_cb)
+
+        self.stream_cb = QCheckBox("생성 중인 커밋 메시지를 실시간으로 표시 (스트리밍)")
+        self.stream_cb.setChecked(self.settings.get('stream_messages', True))
+        layout.addWidget(self.stream_cb)
+
+        self.batch_cb = QCheckBox("작은 변경 파일 여러 개를 한 번의 요청으로 생성")
+        self.batch_cb.setChecked(self.settings.get('batch_requests', False))
+        layout.addWidget(self.batch_cb)
+
+        self.snapshot_cb = QCheckBox("프로젝트를 열 때 마지막 상태를 먼저 표시")
+        self.snapshot_cb.setChecked(self.settings.get('status_snapshot_enabled', True))
+        layout.addWidget(self.snapshot_cb)
+
+        self.warmup_cb = QCheckBox("최근 프로젝트 상태를 백그라운드에서 미리 불러오기")
+        self.warmup_cb.setChecked(self.settings.get('warmup_recent_projects', True))
+        layout.addWidget(self.warmup_cb)
+
         save_btn = QPushButton("설정 저장")
         save_btn.clicked.connect(self.save_settings)
         layout.addWidget(save_btn)
 
         layout.addStretch()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_cache_stats()
+
+    def update_cache_stats(self):
+        try:
+            cache = MessageCache()
+            stats = cache.stats()
+            cache.close()
+        except Exception as e:
+            print(f"Error reading message cache: {str(e)}")
+            self.cache_stats_label.setText("")
+            return
+
+        self.cache_stats_label.setText(
+            f"{stats['entries']}개 항목 · {stats['bytes'] / 1024:.0f} KB · "
+            f"적중 {stats['hits']} / 미스 {stats['misses']}"
+        )
+
+    def clear_cache(self):
+        try:
+            cache = MessageCache()
+            cache.clear()
+            cache.close()
+        except Exception as e:
+            QMessageBox.critical(self, '에러', f'캐시를 비우는 중 오류가 발생했습니다: {str(e)}')
+            return
+        self.update_cache_stats()
+
     def save_settings(self):
         api_key = self.api_key_input.text().strip()
         if not api_key.startswith('sk-'):
             QMessageBox.warning(self, '경고', 'OpenAI API 키는 sk-로 시작해야 합니다.')
             return
 
-        self.settings.set('openai_api_key', api_key)
-        self.settings.set('language', self.language_combo.currentText())
+        self.settings.update({
+            'openai_api_key': api_key,
+            'openai_base_url': self.base_url_input.text().strip(),
+            'language': self.language_combo.currentText(),
+            'diff_context_lines': self.context_lines_spin.value(),
+            'diff_max_chars': self.max_chars_spin.value(),
+            'message_cache_enabled': self.cache_cb.isChecked(),
+            'group_commits': self.group_commits_cb.isChecked(),
+            'local_rules_enabled': self.local_rules_cb.isChecked(),
+            'stream_messages': self.stream_cb.isChecked(),
+            'batch_requests': self.batch_cb.isChecked(),
+            'status_snapshot_enabled': self.snapshot_cb.isChecked(),
+            'warmup_recent_projects': self.warmup_cb.isChecked(),
+        })
         
         QMessageBox.information(self, '성공', '설정이 저장되었습니다.')
         self.back_clicked.emit()
\ No newline at end of file
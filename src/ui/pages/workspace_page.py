@@ -0,0 +1,354 @@
+import threading
+from pathlib import Path
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog,
+                         QTableWidget, QTableWidgetItem, QHeaderView, QProgressDialog, QMessageBox)
+from PyQt6.QtCore import Qt, pyqtSignal, QThread
+from typing import Dict, List, Tuple
+from src.config.settings import Settings
+from src.services.workspace import (RepoStatus, WorkspaceCommit, DEFAULT_PARALLEL_REPOS,
+                                    find_repositories, scan_repositories)
+
+COLUMNS = ["저장소", "브랜치", "변경 파일", "Push 대기"]
+
+class WorkspaceScanWorker(QThread):
+   repo_scanned = pyqtSignal(object)
+   finished = pyqtSignal()
+
+   def __init__(self, paths: List[str]):
+       super().__init__()
+       self.paths = paths
+       self._cancelled = threading.Event()
+
+   def cancel(self):
+       self._cancelled.set()
+
+   def run(self):
+       try:
+           scan_repositories(self.paths, on_result=self.repo_scanned.emit, cancelled=self._cancelled)
+       except Exception as e:
+           print(f"Error scanning workspace: {str(e)}")
+       self.finished.emit()
+
+class WorkspaceCommitWorker(QThread):
+   committed = pyqtSignal(str, list, str)
+   error = pyqtSignal(str, str)
+   repo_finished = pyqtSignal(str, int)
+   finished = pyqtSignal()
+
+   def __init__(self, settings: Settings, repos: Dict[str, List[Tuple[str, str]]]):
+       super().__init__()
+       self.settings = settings
+       self.repos = repos
+       self.workspace_commit = None
+       self._cancelled = False
+
+   def cancel(self):
+       self._cancelled = True
+       if self.workspace_commit:
+           self.workspace_commit.cancel()
+
+   def run(self):
+       from src.services.commit_pipeline import DEFAULT_BATCH_SIZE
+       from src.services.message_cache import MessageCache
+       from src.services.openai_service import OpenAIService, DEFAULT_MAX_DIFF_CHARS
+       from src.services.rate_limiter import RateLimitScheduler, DEFAULT_INITIAL_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+
+       # One service and one scheduler for every repository: max_concurrency
+       # is the budget for the whole workspace, not for each repository.
+       budget = max(1, self.settings.get('max_concurrency', DEFAULT_MAX_CONCURRENCY))
+       use_cache = self.settings.get('message_cache_enabled', True)
+       cache = MessageCache() if use_cache else None
+       try:
+           openai_service = OpenAIService(
+               self.settings.get('openai_api_key'),
+               cache=cache,
+               base_url=self.settings.get('openai_base_url'),
+               scheduler=RateLimitScheduler(max_concurrency=budget,
+                                            initial_concurrency=min(DEFAULT_INITIAL_CONCURRENCY, budget))
+           )
+       except Exception as e:
+           self.error.emit('', str(e))
+           self.finished.emit()
+           return
+
+       self.workspace_commit = WorkspaceCommit(
+           openai_service,
+           self.repos,
+           self.settings.get('language'),
+           max_repos=self.settings.get('workspace_parallel_repos', DEFAULT_PARALLEL_REPOS),
+           on_committed=self.committed.emit,
+           on_error=self.error.emit,
+           on_repo_finished=self.repo_finished.emit,
+           context_lines=self.settings.get('diff_context_lines', 3),
+           max_diff_chars=self.settings.get('diff_max_chars', DEFAULT_MAX_DIFF_CHARS),
+           use_cache=use_cache,
+           group_files=self.settings.get('group_commits', False),
+           use_rules=self.settings.get('local_rules_enabled', True),
+           batch_size=DEFAULT_BATCH_SIZE if self.settings.get('batch_requests', False) else 1
+       )
+       try:
+           if self._cancelled:
+               self.workspace_commit.cancel()
+           self.workspace_commit.run()
+       except Exception as e:
+           self.error.emit('', str(e))
+       finally:
+           openai_service.close()
+           if cache:
+               cache.close()
+       self.finished.emit()
+
+class WorkspacePage(QWidget):
+   back_clicked = pyqtSignal()
+   project_selected = pyqtSignal(str)
+
+   def __init__(self, settings: Settings):
+       super().__init__()
+       self.settings = settings
+       self.statuses: Dict[str, RepoStatus] = {}
+       self.checked: Dict[str, bool] = {}
+       self.scan_worker = None
+       self.commit_worker = None
+       self.init_ui()
+
+   def init_ui(self):
+       layout = QVBoxLayout(self)
+       layout.setSpacing(20)
+
+       header = QHBoxLayout()
+       title = QLabel("워크스페이스")
+       title.setStyleSheet("font-size: 24px; font-weight: bold;")
+       header.addWidget(title)
+       header.addStretch()
+
+       add_btn = QPushButton("저장소 추가")
+       add_btn.clicked.connect(self.add_repositories)
+       header.addWidget(add_btn)
+
+       self.refresh_btn = QPushButton("새로고침")
+       self.refresh_btn.clicked.connect(self.refresh)
+       header.addWidget(self.refresh_btn)
+
+       back_btn = QPushButton("뒤로")
+       back_btn.clicked.connect(self.back_clicked)
+       header.addWidget(back_btn)
+       layout.addLayout(header)
+
+       self.summary_label = QLabel()
+       self.summary_label.setStyleSheet("color: #666;")
+       layout.addWidget(self.summary_label)
+
+       self.table = QTableWidget(0, len(COLUMNS))
+       self.table.setHorizontalHeaderLabels(COLUMNS)
+       self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+       self.table.verticalHeader().setVisible(False)
+       self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+       self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+       self.table.setSortingEnabled(True)
+       self.table.cellDoubleClicked.connect(self.on_row_double_clicked)
+       self.table.setStyleSheet("""
+           QTableWidget {
+               background-color: white;
+               border: 1px solid #ddd;
+               border-radius: 8px;
+           }
+       """)
+       layout.addWidget(self.table)
+
+       buttons = QHBoxLayout()
+       remove_btn = QPushButton("목록에서 제거")
+       remove_btn.clicked.connect(self.remove_selected)
+       buttons.addWidget(remove_btn)
+       buttons.addStretch()
+
+       self.commit_btn = QPushButton("체크한 저장소 모두 커밋")
+       self.commit_btn.clicked.connect(self.commit_checked)
+       buttons.addWidget(self.commit_btn)
+       layout.addLayout(buttons)
+
+       self.update_table()
+
+   def showEvent(self, event):
+       super().showEvent(event)
+       self.refresh()
+
+   def repositories(self) -> List[str]:
+       return list(self.settings.get('workspace_repos', []))
+
+   def add_repositories(self):
+       dir_path = QFileDialog.getExistingDirectory(
+           self,
+           "저장소 또는 저장소들이 있는 디렉토리 선택",
+           str(Path.home()),
+           QFileDialog.Option.ShowDirsOnly
+       )
+       if not dir_path:
+           return
+
+       found = find_repositories(dir_path)
+       if not found:
+           QMessageBox.warning(self, '경고', '선택한 디렉토리에서 Git 저장소를 찾지 못했습니다.')
+           return
+       repos = self.repositories()
+       repos.extend(path for path in found if path not in repos)
+       self.settings.set('workspace_repos', repos)
+       self.refresh()
+
+   def remove_selected(self):
+       selected = {self.table.item(index.row(), 0).data(Qt.ItemDataRole.UserRole)
+                   for index in self.table.selectionModel().selectedRows()}
+       if not selected:
+           return
+       self.settings.set('workspace_repos', [path for path in self.repositories() if path not in selected])
+       for path in selected:
+           self.statuses.pop(path, None)
+       self.update_table()
+
+   def refresh(self):
+       if self.scan_worker or self.commit_worker:
+           return
+       paths = self.repositories()
+       self.statuses = {path: status for path, status in self.statuses.items() if path in paths}
+       if not paths:
+           self.update_table()
+           return
+
+       self.refresh_btn.setEnabled(False)
+       self.summary_label.setText(f"저장소 {len(paths)}개 상태 확인 중...")
+       self.scan_worker = WorkspaceScanWorker(paths)
+       self.scan_worker.repo_scanned.connect(self.on_repo_scanned)
+       self.scan_worker.finished.connect(self.on_scan_finished)
+       self.scan_worker.start()
+
+   def on_repo_scanned(self, status: RepoStatus):
+       self.statuses[status.path] = status
+       self.update_table()
+
+   def on_scan_finished(self):
+       if self.scan_worker:
+           self.scan_worker.wait()
+       self.scan_worker = None
+       self.refresh_btn.setEnabled(True)
+       self.update_table()
+
+   def update_table(self):
+       self.sync_checked()
+       paths = self.repositories()
+       self.table.setSortingEnabled(False)
+       self.table.setRowCount(len(paths))
+       for row, path in enumerate(paths):
+           status = self.statuses.get(path)
+           name_item = QTableWidgetItem(Path(path).name)
+           name_item.setData(Qt.ItemDataRole.UserRole, path)
+           name_item.setToolTip(path)
+           name_item.setFlags(name_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+           name_item.setCheckState(Qt.CheckState.Checked if self.checked.get(path, True)
+                                   else Qt.CheckState.Unchecked)
+           self.table.setItem(row, 0, name_item)
+
+           if status is None:
+               cells = ["…", "", ""]
+           elif status.error:
+               cells = [f"오류: {status.error}", "", ""]
+           else:
+               cells = [status.branch, status.changed, status.unpushed]
+           for column, value in enumerate(cells, start=1):
+               item = QTableWidgetItem()
+               item.setData(Qt.ItemDataRole.DisplayRole, value)
+               self.table.setItem(row, column, item)
+       self.table.setSortingEnabled(True)
+
+       scanned = [status for status in self.statuses.values() if not status.error]
+       dirty = [status for status in scanned if status.changed]
+       self.summary_label.setText(
+           f"저장소 {len(paths)}개 · 변경 있는 저장소 {len(dirty)}개 · "
+           f"변경 파일 {sum(status.changed for status in scanned)}개 · "
+           f"Push 대기 커밋 {sum(status.unpushed for status in scanned)}개"
+       )
+       self.commit_btn.setEnabled(bool(dirty) and self.commit_worker is None)
+
+   def sync_checked(self):
+       # Repositories are checked by default; the table is rebuilt on every
+       # scan result, so the user's choices are kept here.
+       for row in range(self.table.rowCount()):
+           item = self.table.item(row, 0)
+           if item:
+               self.checked[item.data(Qt.ItemDataRole.UserRole)] = item.checkState() == Qt.CheckState.Checked
+
+   def on_row_double_clicked(self, row: int, column: int):
+       path = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+       if Path(path).is_dir():
+           self.project_selected.emit(path)
+
+   def commit_checked(self):
+       self.sync_checked()
+       checked = {path for path, is_checked in self.checked.items() if is_checked}
+       repos = {
+           path: [(file_path, change_type) for file_path, _, change_type in status.files]
+           for path, status in self.statuses.items()
+           if path in checked and not status.error and status.files
+       }
+       if not repos:
+           QMessageBox.warning(self, '경고', '커밋할 변경이 있는 저장소를 선택해주세요.')
+           return
+       if not self.settings.get('openai_api_key'):
+           QMessageBox.warning(self, '설정 필요', 'OpenAI API 키가 설정되지 않았습니다. 설정 페이지에서 API 키를 설정해주세요.')
+           return
+
+       total = sum(len(files) for files in repos.values())
+       reply = QMessageBox.question(
+           self,
+           '워크스페이스 커밋',
+           f'저장소 {len(repos)}개의 변경 파일 {total}개를 모두 커밋하시겠습니까?'
+       )
+       if reply != QMessageBox.StandardButton.Yes:
+           return
+
+       progress = QProgressDialog("커밋 진행 중...", "취소", 0, total, self)
+       progress.setWindowModality(Qt.WindowModality.WindowModal)
+       progress.setAutoClose(False)
+       progress.show()
+
+       self.commit_worker = WorkspaceCommitWorker(self.settings, repos)
+       self.commit_btn.setEnabled(False)
+       errors = []
+       finished_repos = 0
+
+       def on_committed(repo, file_paths, commit_message):
+           progress.setValue(progress.value() + len(file_paths))
+           progress.setLabelText(f"{Path(repo).name} ({finished_repos}/{len(repos)} 완료)\n{commit_message}")
+
+       def on_error(repo, message):
+           errors.append(f"{Path(repo).name}: {message}" if repo else message)
+
+       def on_repo_finished(repo, committed):
+           nonlocal finished_repos
+           finished_repos += 1
+
+       def on_finished():
+           progress.close()
+           self.commit_worker.wait()
+           self.commit_worker = None
+           if errors:
+               details = "\n".join(errors[:10])
+               if len(errors) > 10:
+                   details += f"\n… 외 {len(errors) - 10}개"
+               QMessageBox.warning(self, '일부 실패', f'커밋 중 오류가 발생했습니다:\n{details}')
+           else:
+               QMessageBox.information(self, '완료', f'저장소 {len(repos)}개의 변경이 모두 커밋되었습니다.')
+           self.refresh()
+
+       self.commit_worker.committed.connect(on_committed)
+       self.commit_worker.error.connect(on_error)
+       self.commit_worker.repo_finished.connect(on_repo_finished)
+       self.commit_worker.finished.connect(on_finished)
+       progress.canceled.connect(self.commit_worker.cancel)
+       self.commit_worker.start()
+
+   def shutdown(self):
+       if self.scan_worker:
+           self.scan_worker.cancel()
+           self.scan_worker.wait()
+       if self.commit_worker:
+           self.commit_worker.cancel()
+           self.commit_worker.wait()
@@ -1,14 +1,195 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QCheckBox, QLabel, QScrollArea
-from PyQt6.QtCore import pyqtSignal, QTimer, Qt
-from typing import List, Tuple
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QCheckBox,
+                         QListView, QStyledItemDelegate, QStyle, QStyleOptionViewItem)
+from PyQt6.QtCore import (pyqtSignal, QTimer, Qt, QAbstractListModel, QModelIndex, QRect,
+                      QSize, QEvent)
+from PyQt6.QtGui import QColor, QFont, QFontMetrics
+from typing import List, Set, Tuple
 from pathlib import Path
+from src.services.repo_watcher import RepoWatcher
+
+POLL_INTERVAL_MS = 3000
+FALLBACK_POLL_INTERVAL_MS = 30000
+ROW_HEIGHT = 34
+RESET_THRESHOLD = 2000
+
+STATUS_STYLES = {
+   'deleted': ('#dc3545', '삭제됨'),
+   'modified': ('#ffc107', '수정됨'),
+   'renamed': ('#17a2b8', '이름변경'),
+   'untracked': ('#28a745', '새파일'),
+   'added': ('#28a745', '추가됨'),
+   'conflicted': ('#6f42c1', '충돌')
+}
+
+def _sort_key(entry: Tuple[str, str, str]):
+   return (entry[0].lower(), entry[0])
+
+def _runs(rows: List[int]) -> List[Tuple[int, int]]:
+   runs = []
+   for row in rows:
+       if runs and runs[-1][1] == row - 1:
+           runs[-1] = (runs[-1][0], row)
+       else:
+           runs.append((row, row))
+   return runs
+
+class FileListModel(QAbstractListModel):
+   checked_changed = pyqtSignal()
+
+   def __init__(self, parent=None):
+       super().__init__(parent)
+       self.entries: List[Tuple[str, str, str]] = []
+       self.checked: Set[str] = set()
+
+   def rowCount(self, parent=QModelIndex()):
+       return 0 if parent.isValid() else len(self.entries)
+
+   def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+       if not index.isValid():
+           return None
+       entry = self.entries[index.row()]
+       if role == Qt.ItemDataRole.DisplayRole:
+           return Path(entry[0]).name
+       if role == Qt.ItemDataRole.ToolTipRole:
+           return entry[0]
+       if role == Qt.ItemDataRole.CheckStateRole:
+           return Qt.CheckState.Checked if entry[0] in self.checked else Qt.CheckState.Unchecked
+       if role == Qt.ItemDataRole.UserRole:
+           return entry
+       return None
+
+   def flags(self, index):
+       if not index.isValid():
+           return Qt.ItemFlag.NoItemFlags
+       return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable
+
+   def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+       if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+           return False
+       file_path = self.entries[index.row()][0]
+       if Qt.CheckState(value) == Qt.CheckState.Checked:
+           self.checked.add(file_path)
+       else:
+           self.checked.discard(file_path)
+       self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+       self.checked_changed.emit()
+       return True
+
+   def set_entries(self, files: List[Tuple[str, str, str]]):
+       new_entries = sorted(files, key=_sort_key)
+       if new_entries == self.entries:
+           return
+       new_paths = {entry[0] for entry in new_entries}
+       old_paths = {entry[0] for entry in self.entries}
+
+       removed = [row for row, entry in enumerate(self.entries) if entry[0] not in new_paths]
+       added = [row for row, entry in enumerate(new_entries) if entry[0] not in old_paths]
+
+       if len(removed) + len(added) > RESET_THRESHOLD:
+           self.beginResetModel()
+           self.entries = new_entries
+           self.endResetModel()
+       else:
+           # Both snapshots share one sort order, so after dropping removed
+           # rows the survivors already sit in their final relative order.
+           for first, last in reversed(_runs(removed)):
+               self.beginRemoveRows(QModelIndex(), first, last)
+               del self.entries[first:last + 1]
+               self.endRemoveRows()
+
+           for first, last in _runs(added):
+               self.beginInsertRows(QModelIndex(), first, last)
+               self.entries[first:first] = new_entries[first:last + 1]
+               self.endInsertRows()
+
+           changed = [row for row, entry in enumerate(new_entries) if self.entries[row] != entry]
+           for first, last in _runs(changed):
+               self.entries[first:last + 1] = new_entries[first:last + 1]
+               self.dataChanged.emit(self.index(first), self.index(last))
+
+       if self.checked - new_paths:
+           self.checked &= new_paths
+           self.checked_changed.emit()
+
+   def set_all_checked(self, checked: bool):
+       self.checked = {entry[0] for entry in self.entries} if checked else set()
+       if self.entries:
+           self.dataChanged.emit(self.index(0), self.index(len(self.entries) - 1),
+                                 [Qt.ItemDataRole.CheckStateRole])
+       self.checked_changed.emit()
+
+   def toggle(self, index):
+       state = self.data(index, Qt.ItemDataRole.CheckStateRole)
+       new_state = Qt.CheckState.Unchecked if state == Qt.CheckState.Checked else Qt.CheckState.Checked
+       self.setData(index, new_state, Qt.ItemDataRole.CheckStateRole)
+
+   def checked_entries(self) -> List[Tuple[str, str]]:
+       if not self.checked:
+           return []
+       return [(file_path, change_type) for file_path, _, change_type in self.entries
+               if file_path in self.checked]
+
+class FileItemDelegate(QStyledItemDelegate):
+   def sizeHint(self, option, index):
+       return QSize(option.rect.width(), ROW_HEIGHT)
+
+   def paint(self, painter, option, index):
+       file_path, status, _ = index.data(Qt.ItemDataRole.UserRole)
+       checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+       color, status_text = STATUS_STYLES.get(status, ('#6c757d', status))
+       style = option.widget.style() if option.widget else None
+
+       painter.save()
+       if option.state & QStyle.StateFlag.State_MouseOver:
+           painter.fillRect(option.rect, QColor('#f5f5f5'))
+
+       rect = option.rect.adjusted(10, 0, -10, 0)
+       check_option = QStyleOptionViewItem(option)
+       check_option.rect = QRect(rect.left(), rect.center().y() - 9, 18, 18)
+       check_option.state = QStyle.StateFlag.State_Enabled | (
+           QStyle.StateFlag.State_On if checked else QStyle.StateFlag.State_Off)
+       if style:
+           style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorItemViewItemCheck,
+                               check_option, painter, option.widget)
+
+       x = check_option.rect.right() + 10
+       painter.setFont(option.font)
+       metrics = QFontMetrics(option.font)
+       painter.setPen(QColor('#212529'))
+       for text in (Path(file_path).name, f"({status_text})"):
+           width = metrics.horizontalAdvance(text)
+           painter.drawText(QRect(x, rect.top(), width, rect.height()),
+                            Qt.AlignmentFlag.AlignVCenter, text)
+           x += width + 8
+
+       path_font = QFont(option.font)
+       path_font.setPixelSize(12)
+       painter.setFont(path_font)
+       painter.setPen(QColor(color))
+       path_rect = QRect(x, rect.top(), max(0, rect.right() - x), rect.height())
+       parent_text = QFontMetrics(path_font).elidedText(
+           str(Path(file_path).parent), Qt.TextElideMode.ElideMiddle, path_rect.width())
+       painter.drawText(path_rect, Qt.AlignmentFlag.AlignVCenter, parent_text)
+       painter.restore()
+
+   def editorEvent(self, event, model, option, index):
+       if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+           model.toggle(index)
+           return True
+       if event.type() == QEvent.Type.KeyPress and event.key() in (Qt.Key.Key_Space, Qt.Key.Key_Select):
+           model.toggle(index)
+           return True
+       return False
 
 class FileListWidget(QWidget):
    files_selected = pyqtSignal(list)
+   changes_detected = pyqtSignal()
 
    def __init__(self):
        super().__init__()
-       self.checkboxes = []
+       self.model = FileListModel(self)
+       self.model.checked_changed.connect(self.update_selected_files)
+       self.watcher = None
        self.init_ui()
 
    def init_ui(self):
@@ -39,7 +220,7 @@ class FileListWidget(QWidget):
 
        self.select_all_cb = QCheckBox("전체 선택")
        self.select_all_cb.setStyleSheet("QCheckBox { padding: 5px; }")
-       self.select_all_cb.stateChanged.connect(self.toggle_all)
+       self.select_all_cb.clicked.connect(self.toggle_all)
        header.addWidget(self.select_all_cb)
 
        self.auto_refresh_cb = QCheckBox("자동 새로고침")
@@ -51,117 +232,73 @@ class FileListWidget(QWidget):
        header.addStretch()
        main_layout.addLayout(header)
 
-       scroll_area = QScrollArea()
-       scroll_area.setWidgetResizable(True)
-       scroll_area.setStyleSheet("""
-           QScrollArea {
+       self.list_view = QListView()
+       self.list_view.setModel(self.model)
+       self.list_view.setItemDelegate(FileItemDelegate(self.list_view))
+       self.list_view.setUniformItemSizes(True)
+       self.list_view.setMouseTracking(True)
+       self.list_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+       self.list_view.setStyleSheet("""
+           QListView {
                border: 1px solid #ddd;
                border-radius: 4px;
                background: white;
+               padding: 5px;
            }
        """)
+       main_layout.addWidget(self.list_view)
 
-       scroll_content = QWidget()
-       self.files_layout = QVBoxLayout(scroll_content)
-       self.files_layout.setSpacing(5)
-       self.files_layout.setContentsMargins(10, 10, 10, 10)
-       self.files_layout.addStretch()
-       
-       scroll_area.setWidget(scroll_content)
-       main_layout.addWidget(scroll_area)
-
+       # Polling starts in watch(), once there is a repository to poll.
        self.refresh_timer = QTimer(self)
        self.refresh_timer.timeout.connect(self.refresh_requested)
-       self.refresh_timer.start(3000)
+
+       self.changes_detected.connect(self.refresh_requested)
 
    def refresh_requested(self):
        if hasattr(self.parent(), 'update_file_list'):
            self.parent().update_file_list()
 
-   def toggle_auto_refresh(self, state):
-       if state:
-           self.refresh_timer.start(3000)
+   def watch(self, repo_path: str):
+       self.stop_watching()
+       self.watcher = RepoWatcher(repo_path, self.changes_detected.emit)
+       if self.auto_refresh_cb.isChecked():
+           self.start_auto_refresh()
+
+   def stop_watching(self):
+       if self.watcher:
+           self.watcher.stop()
+           self.watcher = None
+
+   def start_auto_refresh(self):
+       # With a working file watcher the timer is only a safety net for
+       # events the watcher misses (network drives, overflowed queues).
+       if self.watcher and (self.watcher.observer or self.watcher.start()):
+           self.refresh_timer.start(FALLBACK_POLL_INTERVAL_MS)
        else:
+           self.refresh_timer.start(POLL_INTERVAL_MS)
+
+   def toggle_auto_refresh(self, state):
+       if state and self.watcher:
+           self.start_auto_refresh()
+       elif not state:
            self.refresh_timer.stop()
+           if self.watcher:
+               self.watcher.stop()
 
    def set_files(self, files: List[Tuple[str, str, str]]):
-       selected_files = self.get_selected_files()
-       
-       for cb in self.checkboxes:
-           cb.deleteLater()
-       self.checkboxes.clear()
-       
-       while self.files_layout.count():
-           item = self.files_layout.takeAt(0)
-           if item.widget():
-               item.widget().deleteLater()
-           elif item.layout():
-               while item.layout().count():
-                   child = item.layout().takeAt(0)
-                   if child.widget():
-                       child.widget().deleteLater()
-
-       for file_path, status, change_type in sorted(files, key=lambda x: x[0].lower()):
-           file_widget = QWidget()
-           file_widget.setStyleSheet("""
-               QWidget {
-                   border-radius: 4px;
-                   padding: 5px;
-               }
-               QWidget:hover {
-                   background-color: #f5f5f5;
-               }
-           """)
-           
-           file_layout = QHBoxLayout(file_widget)
-           file_layout.setContentsMargins(5, 5, 5, 5)
-           
-           cb = QCheckBox(str(Path(file_path).name))
-           cb.setProperty('full_path', file_path)
-           cb.setProperty('change_type', change_type)
-           
-           if file_path in [f[0] for f in selected_files]:
-               cb.setChecked(True)
-
-           status_colors = {
-               'deleted': ('#dc3545', '삭제됨'),
-               'modified': ('#ffc107', '수정됨'),
-               'renamed': ('#17a2b8', '이름변경'),
-               'untracked': ('#28a745', '새파일')
-           }
-           color, status_text = status_colors.get(status, ('#6c757d', status))
-           
-           file_layout.addWidget(cb)
-           file_layout.addWidget(QLabel(f"({status_text})"))
-           
-           path_label = QLabel(str(Path(file_path).parent))
-           path_label.setStyleSheet(f"color: {color}; font-size: 12px;")
-           file_layout.addWidget(path_label)
-           file_layout.addStretch()
-
-           self.files_layout.insertWidget(self.files_layout.count() - 1, file_widget)
-           self.checkboxes.append(cb)
-           cb.stateChanged.connect(self.update_selected_files)
-
+       self.model.set_entries(files)
        self.update_select_all_state()
 
    def toggle_all(self, state):
-       for cb in self.checkboxes:
-           cb.setChecked(state)
+       self.model.set_all_checked(bool(state))
 
    def update_selected_files(self):
-       selected = [(cb.property('full_path'), cb.property('change_type'))
-                  for cb in self.checkboxes if cb.isChecked()]
-       self.files_selected.emit(selected)
+       self.files_selected.emit(self.get_selected_files())
        self.update_select_all_state()
 
    def update_select_all_state(self):
-       if not self.checkboxes:
-           self.select_all_cb.setChecked(False)
-       else:
-           checked = sum(1 for cb in self.checkboxes if cb.isChecked())
-           self.select_all_cb.setChecked(checked == len(self.checkboxes))
+       total = self.model.rowCount()
+       self.select_all_cb.setChecked(bool(total) and len(self.model.checked) == total)
 
    def get_selected_files(self) -> List[Tuple[str, str]]:
-       return [(cb.property('full_path'), cb.property('change_type'))
-               for cb in self.checkboxes if cb.isChecked()]
\ No newline at end of file
+       return self.model.checked_entries()